@@ -0,0 +1,112 @@
+"""
+Benchmark for headline normalization and the shared title memo.
+
+Feed it one or more result files saved from the app; each file stands in for
+one run (a topic or a day), so titles repeat across them as they do in use:
+
+    python benchmarks/text_normalization.py brutalist_report_*.json
+
+Normalization is timed per title with the original regex implementation and
+with the batch API, and both outputs are checked to be identical. Then every
+file is tokenized and its groups named on one scraper, as batch and watch
+mode do, and the memo's hit rate and throughput are reported.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from brutalist_report import BrutalistReportScraper  # noqa: E402
+
+
+def load_runs(paths):
+    """Returns (path, titles, groups) per result file"""
+    runs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            result = json.load(f)
+        groups = [group["headlines"] for group in result.get("common_topics", [])]
+        titles = [headline["title"] for headlines in groups for headline in headlines]
+        runs.append((path, titles, groups))
+    return runs
+
+
+def regex_normalize(text):
+    """The per-call normalization the batch API replaces"""
+    text = text.lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def rate(count, seconds):
+    return f"{count / seconds:,.0f} titles/s" if seconds else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headline normalization")
+    parser.add_argument("results", nargs="+", help="Saved analysis result JSON files")
+    parser.add_argument("--repeat", type=int, default=5, help="Normalization repetitions")
+    parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=BrutalistReportScraper.FEATURE_CACHE_MAX_ENTRIES,
+        help="Titles kept in the memo",
+    )
+    args = parser.parse_args()
+
+    runs = load_runs(args.results)
+    titles = [title for _, run_titles, _ in runs for title in run_titles]
+    if not titles:
+        print("No headlines found.")
+        sys.exit(1)
+    print(f"Runs: {len(runs)}, titles: {len(titles)}, distinct: {len(set(titles))}")
+
+    scraper = BrutalistReportScraper()
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = [regex_normalize(title) for title in titles]
+    regex_seconds = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        normalized = [" ".join(words) for words in scraper.normalize_titles(titles)]
+    batch_seconds = (time.perf_counter() - start) / args.repeat
+
+    print(f"Regex: {regex_seconds * 1000:.1f} ms ({rate(len(titles), regex_seconds)})")
+    print(f"Batch: {batch_seconds * 1000:.1f} ms ({rate(len(titles), batch_seconds)})")
+
+    # Tokenize each run and name its groups, sharing one memo across runs
+    scraper._feature_cache.max_entries = args.memo_size
+    start = time.perf_counter()
+    for _, run_titles, groups in runs:
+        scraper.headline_features(run_titles)
+        for headlines in groups:
+            scraper.generate_topic_name(headlines)
+    memo_seconds = time.perf_counter() - start
+
+    memo = scraper._feature_cache
+    lookups = memo.hits + memo.misses
+    print(
+        f"Memo: {memo.hits}/{lookups} hits ({memo.hits / lookups:.1%}), "
+        f"{len(memo)} titles held, {rate(len(titles), memo_seconds)} tokenized and named"
+    )
+
+    mismatches = [
+        (title, old, new)
+        for title, old, new in zip(titles, expected, normalized)
+        if old != new
+    ]
+    for title, old, new in mismatches[:10]:
+        print(f"Normalization changed for {title!r}: {old!r} -> {new!r}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for BrutalistReportScraper.generate_topic_name on large groups.
+
+Feed it one or more result files saved from the app (ideally last-week runs):
+
+    python benchmarks/topic_naming.py brutalist_report_last_week_all_*.json
+
+Groups with at least --min-size headlines are benchmarked as-is and their
+names are checked against the stored topic_name. When a file has no group
+that large, its headlines are pooled into synthetic groups of --min-size so
+the naming engine is still exercised at that scale.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from brutalist_report import BrutalistReportScraper  # noqa: E402
+
+
+def load_groups(paths, min_size):
+    """Returns (label, headlines, expected_name) tuples for the benchmark"""
+    groups = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            result = json.load(f)
+
+        pooled = []
+        found_large = False
+        for group in result.get("common_topics", []):
+            headlines = group["headlines"]
+            pooled.extend(headlines)
+            if len(headlines) >= min_size:
+                found_large = True
+                groups.append((path, headlines, group.get("topic_name")))
+
+        if not found_large and len(pooled) >= min_size:
+            for start in range(0, len(pooled) - min_size + 1, min_size):
+                groups.append((f"{path} (pooled)", pooled[start : start + min_size], None))
+
+    return groups
+
+
+def time_naming(groups, scraper, repeat):
+    """Times naming every group `repeat` times and returns (seconds, names)"""
+    names = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        names = [scraper.generate_topic_name(headlines) for _, headlines, _ in groups]
+    return time.perf_counter() - start, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark topic naming on large groups")
+    parser.add_argument("results", nargs="+", help="Saved analysis result JSON files")
+    parser.add_argument("--min-size", type=int, default=500, help="Minimum group size")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm-cache repetitions")
+    args = parser.parse_args()
+
+    groups = load_groups(args.results, args.min_size)
+    if not groups:
+        print(f"No groups with at least {args.min_size} headlines found.")
+        sys.exit(1)
+
+    headline_total = sum(len(headlines) for _, headlines, _ in groups)
+    print(f"Groups: {len(groups)}, headlines: {headline_total}")
+
+    # Cold: a fresh scraper has to tokenize every title
+    scraper = BrutalistReportScraper()
+    cold_seconds, names = time_naming(groups, scraper, 1)
+    print(f"Cold: {cold_seconds * 1000:.1f} ms ({headline_total / cold_seconds:.0f} headlines/s)")
+
+    # Warm: tokens come from the cache, as they do after clustering
+    warm_seconds, _ = time_naming(groups, scraper, args.repeat)
+    per_pass = warm_seconds / args.repeat
+    print(f"Warm: {per_pass * 1000:.1f} ms per pass ({headline_total / per_pass:.0f} headlines/s)")
+
+    mismatches = [
+        (label, expected, name)
+        for (label, _, expected), name in zip(groups, names)
+        if expected is not None and expected != name
+    ]
+    for label, expected, name in mismatches:
+        print(f"Name changed in {label}: {expected!r} -> {name!r}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
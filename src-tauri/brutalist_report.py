@@ -3,13 +3,45 @@ from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import json
 import argparse
+import base64
+import mmap
+import hashlib
+import heapq
+import math
+import multiprocessing
 import os
 import sys
 import time
 import re
-from collections import Counter
+import signal
+import sqlite3
+import threading
+import _thread
+from array import array
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from urllib.parse import urljoin, urlparse
 
+try:
+    import orjson  # Optional: much faster encoding of large results
+except ImportError:
+    orjson = None
+
+
+class AnalysisCancelled(BaseException):
+    """
+    Raised at a cancellation checkpoint once a run has been cancelled.
+    Like KeyboardInterrupt it is not an Exception, so the broad error
+    handlers around scraping and image extraction let it through.
+    """
+
 
 class BrutalistReportScraper:
     """
@@ -32,18 +64,345 @@ class BrutalistReportScraper:
         "sports",
     ]
 
+    # Words ignored when scoring similarity and naming topics
+    STOP_WORDS = {
+        "a",
+        "an",
+        "the",
+        "and",
+        "but",
+        "or",
+        "for",
+        "nor",
+        "on",
+        "at",
+        "to",
+        "from",
+        "by",
+        "with",
+        "in",
+        "of",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "can",
+        "could",
+        "will",
+        "would",
+        "shall",
+        "should",
+        "may",
+        "might",
+        "must",
+        "that",
+        "which",
+        "who",
+        "whom",
+        "this",
+        "these",
+        "those",
+        "how",
+        "why",
+        "when",
+        "where",
+        "what",
+        # custom
+        "hn",
+        "nyt",
+        "know",
+        "best",
+        "than",
+        "just",
+        "your",
+        "its",
+        "hint and answers",
+        "you",
+    }
+
+    # Keyword pairs that suggest two headlines are about different topics
+    CONFLICTING_PAIRS = [
+        ("election", "sports"),
+        ("politics", "gaming"),
+        ("business", "weather"),
+        ("covid", "entertainment"),
+        ("war", "tech"),
+        ("climate", "fashion"),
+    ]
+
+    # Punctuation is replaced by spaces when normalizing; ASCII titles (the
+    # vast majority) go through a byte translate table instead of the regex
+    PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+    PUNCTUATION_TABLE = bytes(
+        code if chr(code).isalnum() or chr(code) == "_" or chr(code).isspace() else 0x20
+        for code in range(256)
+    )
+
+    # Word stems that make a good second word for entity-based topic names
+    ACTION_WORDS = [
+        "announce",
+        "launch",
+        "report",
+        "reveal",
+        "update",
+        "plan",
+        "face",
+        "deal",
+        "issue",
+        "problem",
+        "crisis",
+    ]
+
+    # Concurrent page fetches used by batch mode
+    MAX_FETCH_WORKERS = 8
+
+    # Below this many distinct titles a process pool costs more than it saves
+    PARALLEL_MIN_TITLES = 2000
+
+    # Rows scored between cancellation checks when scoring in-process
+    SCORING_BLOCK_ROWS = 256
+
+    # Pair scores are tallied in whole-point bins, the last one open-ended.
+    # When more pairs than MAX_EDGES_PER_TITLE per title reach the grouping
+    # threshold, only the highest-scoring bins within that budget are kept.
+    SCORE_HISTOGRAM_BINS = 64
+    MAX_EDGES_PER_TITLE = 64
+
+    # Tokenized titles memoized for scoring and naming across topics and runs
+    FEATURE_CACHE_MAX_ENTRIES = 200000
+
+    # Named groups remembered between watch-mode refreshes
+    WATCH_GROUP_CACHE_SIZE = 512
+
+    # Cumulative share of a --deadline by which each stage must finish.
+    # Clustering is required work and always runs to completion.
+    STAGE_DEADLINE_SHARES = {"fetch": 0.6, "images": 1.0}
+
+    # Scraped pages kept on disk, and how long they are served without
+    # revalidating: today's page changes often, dated pages rarely
+    PAGE_CACHE_MAX_ENTRIES = 256
+    PAGE_CACHE_TTL_TODAY = 15 * 60
+    PAGE_CACHE_TTL_DATED = 24 * 60 * 60
+
+    # Extracted article images kept on disk, and article images and probed
+    # image sizes kept in memory by a long-lived process
+    IMAGE_CACHE_MAX_ENTRIES = 4096
+    IMAGE_MEMO_MAX_ENTRIES = 1024
+
+    # Image probing reads at most this much of an image within this many
+    # seconds, and rejects images smaller than the minimum size
+    IMAGE_PROBE_BYTES = 16 * 1024
+    IMAGE_PROBE_TIMEOUT = 3
+    IMAGE_MIN_WIDTH = 200
+    IMAGE_MIN_HEIGHT = 100
+
+    # Prefetch fetches gently and resolves images for the largest groups only
+    PREFETCH_FETCH_WORKERS = 2
+    PREFETCH_IMAGE_GROUPS = 12
+
+    # Pages appended to the headline archive per commit
+    ARCHIVE_IMPORT_BATCH = 100
+
+    # Attempts per backfill page before it is marked failed
+    BACKFILL_MAX_ATTEMPTS = 3
+
+    # Document-frequency table: terms kept, titles counted before counts are
+    # halved, and titles seen before any term is treated as too common
+    DF_TABLE_MAX_TERMS = 50000
+    DF_TABLE_MAX_DOCUMENTS = 200000
+    DF_MIN_DOCUMENTS = 5000
+
+    # Analysis results kept on disk; bump the version when grouping changes
+    RESULT_CACHE_MAX_ENTRIES = 64
+    RESULT_CACHE_VERSION = 1
+
     def __init__(self):
         self.base_url = "https://brutalist.report"
         self.progress_bar = None
-        # Adjusted similarity thresholds to be more balanced between topic and general
+        # Minimum pair scores for grouping; stricter for mixed topics and for
+        # last week's larger corpus
         self.similarity_thresholds = {
-            "topic": 4,  # Topic-specific content needs 4 common words
-            "general": 4,  # General content also needs 4 common words
-            "topic_last_week": 5,  # Topic content from last week needs 5 common words
-            "general_last_week": 6,  # General content from last week needs 6 common words
+            "topic": 9,
+            "general": 10,
+            "topic_last_week": 12,
+            "general_last_week": 14,
         }
         # Minimum number of articles required to form a group
         self.min_group_size = 5
+        # Per-title tokens shared by similarity scoring and topic naming
+        self._feature_cache = LRUMemo(self.FEATURE_CACHE_MAX_ENTRIES)
+        # Processes used for pairwise scoring (1 = score in this process)
+        self.workers = 1
+        # Image extraction futures by article URL, shared across topics and
+        # by concurrent requests for the same article
+        self._image_cache = LRUMemo(self.IMAGE_MEMO_MAX_ENTRIES)
+        self._image_lock = threading.Lock()
+        # Extract group images during analysis; otherwise they are looked up
+        # on demand with fetch_group_images
+        self.extract_images = False
+        # Check each candidate image's dimensions before picking it, and the
+        # probed (width, height) by image URL
+        self.probe_images = False
+        self._image_sizes = LRUMemo(self.IMAGE_MEMO_MAX_ENTRIES)
+        # One pooled HTTP session for every page and article request
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=self.MAX_FETCH_WORKERS
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Progress lines may come from fetch threads
+        self._output_lock = threading.Lock()
+        # Set by cancel(); checked at every cancellation checkpoint
+        self._cancel_event = threading.Event()
+        self.cancel_reason = None
+        # Overall time budget for a run in seconds (None = unlimited)
+        self.deadline = None
+        self._start_run_clock()
+        # Result output: "full" or "compact", to stdout or to output_path
+        self.output_format = "full"
+        self.output_path = None
+        # Content-addressed analysis results (None disables the cache)
+        self.cache_dir = default_cache_dir()
+        self.result_cache = DiskCache(
+            os.path.join(self.cache_dir, "results"), self.RESULT_CACHE_MAX_ENTRIES
+        )
+        # Scraped pages and article images, warmed by prefetch
+        self.page_cache = DiskCache(
+            os.path.join(self.cache_dir, "pages"), self.PAGE_CACHE_MAX_ENTRIES
+        )
+        self.image_disk_cache = DiskCache(
+            os.path.join(self.cache_dir, "images"), self.IMAGE_CACHE_MAX_ENTRIES
+        )
+        # How often each word and phrase appears in distinct titles across
+        # runs; with `max_df` set, terms in more than that share of titles
+        # generate no candidate pairs (None = every term does)
+        self.doc_freq = DocumentFrequencyTable(
+            os.path.join(self.cache_dir, "doc_freq.json"),
+            self.DF_TABLE_MAX_TERMS,
+            self.DF_TABLE_MAX_DOCUMENTS,
+        )
+        self.max_df = None
+        # Only assemble the K largest groups (None = every group)
+        self.top_k = None
+        # Counters and histograms; a no-op registry unless metrics are enabled
+        self.metrics = NullMetrics()
+        self.metrics_path = None
+
+    def cancel(self, reason="cancelled"):
+        """
+        Cancels the current run: checkpoints start raising AnalysisCancelled
+        and pooled HTTP connections are closed. Safe to call from any thread.
+        """
+        if self._cancel_event.is_set():
+            return
+        self.cancel_reason = reason
+        self._cancel_event.set()
+        self.session.close()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _check_cancelled(self):
+        """Cancellation checkpoint"""
+        if self._cancel_event.is_set():
+            raise AnalysisCancelled(self.cancel_reason)
+
+    def _start_run_clock(self):
+        """Resets stage timings and deadline tracking for a new run"""
+        self._run_started = time.monotonic()
+        self._stage_times = {}
+        self._stage_stack = []
+        self._exceeded_stages = []
+
+    @contextmanager
+    def _timed_stage(self, stage):
+        """Adds the time spent in the block to `stage`, excluding nested stages"""
+        started = time.monotonic()
+        self._stage_stack.append(0.0)
+        try:
+            yield
+        finally:
+            nested = self._stage_stack.pop()
+            elapsed = time.monotonic() - started
+            self._stage_times[stage] = self._stage_times.get(stage, 0.0) + elapsed - nested
+            self.metrics.inc("brutalist_stage_seconds", elapsed - nested, stage=stage)
+            if self._stage_stack:
+                self._stage_stack[-1] += elapsed
+
+    def _time_left(self, stage):
+        """Seconds left in `stage`'s budget, or None without a deadline"""
+        if self.deadline is None:
+            return None
+        stage_end = self._run_started + self.deadline * self.STAGE_DEADLINE_SHARES[stage]
+        return stage_end - time.monotonic()
+
+    def _stage_expired(self, stage):
+        """True (and recorded) once `stage` has used up its budget"""
+        time_left = self._time_left(stage)
+        if time_left is None or time_left > 0:
+            return False
+        if stage not in self._exceeded_stages:
+            self._exceeded_stages.append(stage)
+        return True
+
+    def _request_timeout(self, stage, default):
+        """Caps a request timeout to what is left of `stage`'s budget"""
+        time_left = self._time_left(stage)
+        if time_left is None:
+            return default
+        time_left = max(time_left, 0.5)
+        return time_left if default is None else min(default, time_left)
+
+    def _run_timings(self):
+        """Per-stage timings of the current run, in seconds"""
+        timings = {
+            stage: round(seconds, 3) for stage, seconds in self._stage_times.items()
+        }
+        timings["total"] = round(time.monotonic() - self._run_started, 3)
+        return timings
+
+    def _http_get(self, url, kind, **kwargs):
+        """
+        GETs `url` on the shared session, recording the outcome, bytes and
+        latency per host. `kind` is "page", "article" or "image". Streamed
+        responses are left unread, so their bytes are the caller's to record.
+        """
+        host = urlparse(url).hostname or ""
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.metrics.inc("brutalist_fetches", kind=kind, host=host, outcome="error")
+            raise
+        self.metrics.observe(
+            "brutalist_fetch_duration_seconds",
+            time.monotonic() - started,
+            kind=kind,
+            host=host,
+        )
+        if response.status_code == 304:
+            outcome = "not_modified"
+        elif response.ok:
+            outcome = "ok"
+        else:
+            outcome = "error"
+        self.metrics.inc("brutalist_fetches", kind=kind, host=host, outcome=outcome)
+        if not kwargs.get("stream"):
+            self.metrics.inc(
+                "brutalist_downloaded_bytes", len(response.content), kind=kind, host=host
+            )
+        return response
 
     def create_url(self, topic=None, before_date=None):
         """Constructs URL based on topic and date parameters"""
@@ -60,17 +419,44 @@ class BrutalistReportScraper:
         return url
 
     def scrape_page(self, url):
-        """Scrapes a single brutalist.report page"""
+        """
+        Scrapes a single brutalist.report page. Pages are cached on disk:
+        a recent copy is used as-is, an older one is revalidated with a
+        conditional GET and is also the fallback when fetching fails.
+        """
+        cache_key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        cached = self.page_cache.get(cache_key) if self.page_cache is not None else None
+        ttl = self.PAGE_CACHE_TTL_DATED if "?before=" in url else self.PAGE_CACHE_TTL_TODAY
+        if cached is not None and time.time() - cached["fetched_at"] < ttl:
+            self.metrics.inc("brutalist_cache_requests", cache="page", result="hit")
+            return cached["news_data"]
+        self.metrics.inc("brutalist_cache_requests", cache="page", result="miss")
+
+        if self._stage_expired("fetch"):
+            self.update_progress(f"Deadline reached, skipping {url}")
+            return cached and cached["news_data"]
+
         self.update_progress("Fetching URL: " + url)
+        state = dict(cached or {})
         try:
-            response = requests.get(url)
-            response.raise_for_status()
+            news_data = self.fetch_page_if_changed(url, state)
         except requests.RequestException as e:
             self.update_progress(f"Error fetching {url}: {e}")
-            return None
+            return cached and cached["news_data"]
+
+        # Unchanged since the cached copy (304 or same content)
+        if news_data is None and cached is not None:
+            news_data = cached["news_data"]
+        if news_data is not None and self.page_cache is not None:
+            state["fetched_at"] = time.time()
+            state["news_data"] = news_data
+            self.page_cache.put(cache_key, state)
+        return news_data
 
+    def parse_page(self, html, url):
+        """Extracts per-source headlines from a brutalist.report page"""
         # Parse the HTML
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(html, "html.parser")
 
         # Find the brutal-grid div that contains news sections
         brutal_grid = soup.find("div", class_="brutal-grid")
@@ -155,14 +541,85 @@ class BrutalistReportScraper:
         )
         return self.scrape_page(url)
 
-    def scrape_last_week(self, topic=None):
-        """Scrapes headlines from the past week, optionally filtered by topic"""
-        # Generate dates for the past week
-        current_date = datetime.now().date()
+    def _window_dates(self, days=None, since=None, until=None):
+        """
+        Returns the `before` dates of a scrape window, newest first.
+        `until` defaults to two days ago (the newest day of a last-week
+        scrape); the window then spans `days` days or reaches back to `since`.
+        """
+        if until is None:
+            until = datetime.now().date() - timedelta(days=2)
+        if since is None:
+            since = until - timedelta(days=(days or 7) - 1)
+
         dates = []
-        for i in range(2, 9):  # 2 to 8 inclusive (7 days)
-            date = current_date - timedelta(days=i)
+        date = until
+        while date >= since:
             dates.append(date.strftime("%Y-%m-%d"))
+            date -= timedelta(days=1)
+        return dates
+
+    def _last_week_dates(self):
+        """Returns the past week's `before` dates, newest first"""
+        return self._window_dates(days=7)
+
+    def _merge_sources(self, aggregated_data, news_data):
+        """
+        Appends a scraped page's headlines to aggregated per-source lists.
+        Strings are interned, repeated headlines share one record and the
+        page's new titles are tokenized into the aggregate's index in one
+        batch, so memory grows with distinct headlines rather than with pages.
+        """
+        if not news_data or not news_data.get("sources"):
+            return
+
+        index = aggregated_data.setdefault("_index", HeadlineIndex(self))
+        records = aggregated_data.setdefault("_records", {})
+        new_titles = []
+        for source, headlines in news_data["sources"].items():
+            source = sys.intern(source)
+            if source not in aggregated_data["sources"]:
+                aggregated_data["sources"][source] = []
+            merged = aggregated_data["sources"][source]
+
+            for headline in headlines:
+                source_link = headline.get("source_link")
+                key = (
+                    source,
+                    headline["title"],
+                    headline["url"],
+                    headline.get("time"),
+                    source_link and (source_link["text"], source_link["url"]),
+                )
+                record = records.get(key)
+                if record is None:
+                    record = {
+                        "title": sys.intern(headline["title"]),
+                        "url": sys.intern(headline["url"]),
+                        "time": headline.get("time"),
+                        "source_link": source_link,
+                    }
+                    records[key] = record
+                    new_titles.append(record["title"])
+                merged.append(record)
+        index.add_many(new_titles)
+
+    def iter_window_pages(self, topic=None, dates=None):
+        """
+        Lazily scrapes one page per `before` date, yielding (date, news_data)
+        so each page can be folded into the aggregate and then released.
+        """
+        for before_date in dates or self._last_week_dates():
+            self._check_cancelled()
+            yield before_date, self.scrape_page(self.create_url(topic, before_date))
+
+    def scrape_last_week(self, topic=None):
+        """Scrapes headlines from the past week, optionally filtered by topic"""
+        return self.scrape_window(topic, self._last_week_dates())
+
+    def scrape_window(self, topic=None, dates=None):
+        """Scrapes headlines for a window of `before` dates (newest first)"""
+        dates = dates or self._last_week_dates()
 
         # Scrape data for each date
         aggregated_data = {
@@ -170,26 +627,23 @@ class BrutalistReportScraper:
             "sources": {},
         }
 
+        period = "past week" if len(dates) == 7 else f"{len(dates)} days"
         self.update_progress(
             json.dumps(
                 {
                     "status": "progress",
-                    "message": f"Scraping past week ({aggregated_data['date_range']}){f' for {topic}' if topic else ''}...",
+                    "message": f"Scraping {period} ({aggregated_data['date_range']}){f' for {topic}' if topic else ''}...",
                     "processed": 0,
                     "total": len(dates),
                 }
             )
         )
 
-        for i, before_date in enumerate(dates, 1):
-            url = self.create_url(topic, before_date)
-            news_data = self.scrape_page(url)
-
-            if news_data and news_data.get("sources"):
-                for source, headlines in news_data["sources"].items():
-                    if source not in aggregated_data["sources"]:
-                        aggregated_data["sources"][source] = []
-                    aggregated_data["sources"][source].extend(headlines)
+        for i, (before_date, news_data) in enumerate(
+            self.iter_window_pages(topic, dates), 1
+        ):
+            self._check_cancelled()
+            self._merge_sources(aggregated_data, news_data)
 
             # Update progress
             self.update_progress(
@@ -203,8 +657,84 @@ class BrutalistReportScraper:
                 )
             )
 
+        # Record dedup is only needed while pages are still arriving
+        aggregated_data.pop("_records", None)
         return aggregated_data
 
+    def scrape_batch(self, topics, last_week=False, dates=None):
+        """
+        Scrapes several topics at once, fetching every page concurrently.
+        `topics` may contain None for the front page. Returns a dict mapping
+        each topic to its news data (None when nothing could be fetched).
+        """
+        if dates is None:
+            dates = self._last_week_dates() if last_week else [None]
+
+        # One fetch per (topic, date), shared by every topic in the batch
+        jobs = [(topic, i) for topic in topics for i in range(len(dates))]
+        urls = [self.create_url(topic, dates[i]) for topic, i in jobs]
+
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "progress",
+                    "message": f"Scraping {len(urls)} pages for {len(topics)} topics...",
+                    "processed": 0,
+                    "total": len(urls),
+                }
+            )
+        )
+
+        batch_data = {}
+        if dates != [None]:
+            for topic in topics:
+                batch_data[topic] = {
+                    "date_range": f"{dates[-1]} to {dates[0]}",
+                    "sources": {},
+                }
+        # Pages are merged as soon as every newer date of their topic is in,
+        # so each topic matches a sequential scrape; only pages that arrive
+        # ahead of that order are held
+        early_pages = {topic: {} for topic in topics}
+        next_date = dict.fromkeys(topics, 0)
+
+        executor = ThreadPoolExecutor(max_workers=self.MAX_FETCH_WORKERS)
+        try:
+            futures = {
+                executor.submit(self.scrape_page, url): (url, topic, date_index)
+                for url, (topic, date_index) in zip(urls, jobs)
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                self._check_cancelled()
+                url, topic, date_index = futures.pop(future)
+                if dates == [None]:
+                    batch_data[topic] = future.result()
+                else:
+                    pending = early_pages[topic]
+                    pending[date_index] = future.result()
+                    while next_date[topic] in pending:
+                        self._merge_sources(
+                            batch_data[topic], pending.pop(next_date[topic])
+                        )
+                        next_date[topic] += 1
+                self.update_progress(
+                    json.dumps(
+                        {
+                            "status": "progress",
+                            "message": f"Fetched {url}",
+                            "processed": i,
+                            "total": len(urls),
+                        }
+                    )
+                )
+        finally:
+            # After a cancel, drop queued fetches and don't wait for in-flight ones
+            executor.shutdown(wait=not self.cancelled, cancel_futures=True)
+
+        for news_data in batch_data.values():
+            news_data.pop("_records", None)
+        return batch_data
+
     # =====================================================================
     # EXPERIMENTAL FEATURE: Article Image Extraction
     # Improved version with better efficiency and reliability
@@ -222,7 +752,12 @@ class BrutalistReportScraper:
                 'Accept-Language': 'en-US,en;q=0.5',
             }
             
-            response = requests.get(article_url, headers=headers, timeout=8)
+            response = self._http_get(
+                article_url,
+                "article",
+                headers=headers,
+                timeout=self._request_timeout("images", 8),
+            )
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -336,6 +871,218 @@ class BrutalistReportScraper:
                 'error_type': type(e).__name__
             }
     
+    def _article_image(self, article_url):
+        """
+        Extracts an article's image once per process. Articles often appear
+        under several topics or groups, and concurrent callers for the same
+        URL wait on the fetch already in flight instead of starting another.
+        Errors are only shared with those callers; the next request retries.
+        """
+        with self._image_lock:
+            future = self._image_cache.get(article_url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._image_cache.put(article_url, future)
+        self.metrics.inc(
+            "brutalist_cache_requests", cache="image", result="miss" if owner else "hit"
+        )
+
+        if owner:
+            try:
+                image = self._stored_article_image(article_url)
+            except BaseException as e:
+                # Cancelled: let a later request try again
+                with self._image_lock:
+                    self._image_cache.discard(article_url, future)
+                future.set_exception(e)
+                raise
+            if image is not None and "error" in image:
+                # Timeouts and server errors may well pass on the next try
+                with self._image_lock:
+                    self._image_cache.discard(article_url, future)
+            future.set_result(image)
+        return future.result()
+
+    def _stored_article_image(self, article_url):
+        """
+        extract_article_image backed by the on-disk image cache. Found images
+        and articles without one are stored; errors are retried next time.
+        """
+        if self.image_disk_cache is None:
+            return self.extract_article_image(article_url)
+
+        cache_key = hashlib.sha256(article_url.encode("utf-8")).hexdigest()
+        stored = self.image_disk_cache.get(cache_key)
+        self.metrics.inc(
+            "brutalist_cache_requests",
+            cache="image_disk",
+            result="miss" if stored is None else "hit",
+        )
+        if stored is not None:
+            return stored["image"]
+
+        image = self.extract_article_image(article_url)
+        if image is None or "url" in image:
+            self.image_disk_cache.put(cache_key, {"image": image})
+        return image
+
+    def probe_image_size(self, image_url):
+        """
+        Returns an image's (width, height) read from the header in its first
+        IMAGE_PROBE_BYTES, fetched with a Range request. Missing images (404
+        or 410) and non-image content probe as (0, 0); None means the size is
+        unknown: the request failed, was refused (e.g. 403, 429 or 5xx) or the
+        header could not be read within the byte and time limits. Only sizes
+        read from a header are remembered, in memory and in the on-disk image
+        cache, so a failed probe is retried on the next lookup.
+        """
+        with self._image_lock:
+            size = self._image_sizes.get(image_url)
+        if size is not None:
+            return size
+
+        cache_key = hashlib.sha256(f"size:{image_url}".encode("utf-8")).hexdigest()
+        stored = self.image_disk_cache.get(cache_key) if self.image_disk_cache else None
+        if stored is not None:
+            size = tuple(stored["size"])
+        else:
+            size = self._read_image_size(image_url)
+            if size is None or size == (0, 0):
+                return size
+            if self.image_disk_cache is not None:
+                self.image_disk_cache.put(cache_key, {"size": size})
+
+        with self._image_lock:
+            self._image_sizes.put(image_url, size)
+        return size
+
+    def _read_image_size(self, image_url):
+        started = time.monotonic()
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)',
+            'Accept': 'image/*',
+            'Range': f"bytes=0-{self.IMAGE_PROBE_BYTES - 1}",
+        }
+        data = bytearray()
+        try:
+            response = self._http_get(
+                image_url,
+                "image",
+                headers=headers,
+                timeout=self._request_timeout("images", self.IMAGE_PROBE_TIMEOUT),
+                stream=True,
+            )
+            try:
+                if response.status_code in (404, 410):
+                    return (0, 0)
+                # Refusals and server errors may well pass on the next try
+                if not response.ok:
+                    return None
+                content_type = response.headers.get("Content-Type", "image/")
+                if not content_type.startswith("image/"):
+                    return (0, 0)
+                # Servers that ignore Range send the whole image; stop reading
+                # once the header is parsed or a limit is reached
+                for chunk in response.iter_content(4096):
+                    data += chunk
+                    size = image_dimensions(data)
+                    if size is not None:
+                        return size
+                    if (
+                        len(data) >= self.IMAGE_PROBE_BYTES
+                        or time.monotonic() - started > self.IMAGE_PROBE_TIMEOUT
+                    ):
+                        return None
+                return None
+            finally:
+                response.close()
+                self.metrics.inc(
+                    "brutalist_downloaded_bytes",
+                    len(data),
+                    kind="image",
+                    host=urlparse(image_url).hostname or "",
+                )
+        except requests.RequestException:
+            return None
+
+    def _probed_article_image(self, article_url):
+        """_article_image, rejecting images probed smaller than the minimum size"""
+        image = self._article_image(article_url)
+        if not image or "url" not in image:
+            return image
+
+        size = self.probe_image_size(image["url"])
+        if size is None:
+            self.metrics.inc("brutalist_image_probes", outcome="unknown")
+            return image
+        width, height = size
+        if size == (0, 0):
+            self.metrics.inc("brutalist_image_probes", outcome="unavailable")
+            return {
+                'error': 'Image could not be loaded',
+                'source_url': article_url,
+                'error_type': 'ImageUnavailable',
+            }
+        if width < self.IMAGE_MIN_WIDTH or height < self.IMAGE_MIN_HEIGHT:
+            self.metrics.inc("brutalist_image_probes", outcome="too_small")
+            return {
+                'error': f"Image too small ({width}x{height})",
+                'source_url': article_url,
+                'error_type': 'ImageTooSmall',
+            }
+        self.metrics.inc("brutalist_image_probes", outcome="ok")
+        return dict(image, width=width, height=height)
+
+    def fetch_group_images(self, groups):
+        """
+        On-demand image lookup for groups of an earlier analysis. Each group
+        needs an "id" and its "headlines" (with source and url). Groups are
+        looked up concurrently and a {"status": "image"} event is printed as
+        each one resolves. Returns the images by group id.
+        """
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "progress",
+                    "message": f"Extracting images for {len(groups)} groups...",
+                    "processed": 0,
+                    "total": len(groups),
+                }
+            )
+        )
+
+        images = {}
+        executor = ThreadPoolExecutor(max_workers=self.MAX_FETCH_WORKERS)
+        try:
+            futures = {
+                executor.submit(
+                    self.extract_images_from_group,
+                    group["headlines"],
+                    group.get("topic_name") or f"group {group['id']}",
+                ): group["id"]
+                for group in groups
+            }
+            for future in as_completed(futures):
+                self._check_cancelled()
+                group_id = futures[future]
+                try:
+                    image = future.result()
+                except Exception as e:
+                    image = {
+                        "error": f"Unexpected error during image extraction: {str(e)}",
+                        "error_type": "UnexpectedError",
+                        "attempted_sources": [],
+                        "total_attempts": 0,
+                    }
+                images[group_id] = image
+                self.update_progress(
+                    json.dumps({"status": "image", "id": group_id, "image": image})
+                )
+        finally:
+            executor.shutdown(wait=not self.cancelled, cancel_futures=True)
+        return images
+
     def extract_images_from_group(self, similar_headlines, topic_name):
         """
         Improved image extraction with smarter source selection.
@@ -369,36 +1116,68 @@ class BrutalistReportScraper:
         # Then add remaining sources
         remaining_sources = [s for s in headlines_by_source if s not in sources_to_try]
         import random
-        random.shuffle(remaining_sources)
+        # Shuffle the same way for the same group, so prefetched images are
+        # the ones a later lookup tries
+        random.Random(similar_headlines[0]["url"]).shuffle(remaining_sources)
         sources_to_try.extend(remaining_sources)
         
         attempted_sources = []
         errors = []
-        
+
         # Try only 3 sources maximum for efficiency
-        for source in sources_to_try[:3]:
-            # Pick the first headline from this source (usually the most important)
-            headline = headlines_by_source[source][0]
-            attempted_sources.append(source)
+        candidates = sources_to_try[:3]
+        probes = None
+        if self.probe_images:
+            # Extract and probe every candidate at once; the first source in
+            # priority order with a large enough image still wins
+            executor = ThreadPoolExecutor(max_workers=max(1, len(candidates)))
+            probes = [
+                executor.submit(
+                    self._probed_article_image, headlines_by_source[source][0]["url"]
+                )
+                for source in candidates
+            ]
+            executor.shutdown(wait=False)
+        try:
+            for position, source in enumerate(candidates):
+                self._check_cancelled()
+                if self._stage_expired("images"):
+                    return {
+                        'error': 'Run deadline reached before an image could be extracted',
+                        'error_type': 'DeadlineExceeded',
+                        'attempted_sources': attempted_sources,
+                        'detailed_errors': errors,
+                        'total_attempts': len(attempted_sources)
+                    }
+
+                # Pick the first headline from this source (usually the most important)
+                headline = headlines_by_source[source][0]
+                attempted_sources.append(source)
             
-            self.update_progress(json.dumps({
-                "status": "progress",
-                "message": f"Extracting image from {source} for: {topic_name[:40]}...",
-            }))
+                self.update_progress(json.dumps({
+                    "status": "progress",
+                    "message": f"Extracting image from {source} for: {topic_name[:40]}...",
+                }))
             
-            result = self.extract_article_image(headline["url"])
+                if probes is None:
+                    result = self._article_image(headline["url"])
+                else:
+                    result = probes[position].result()
             
-            if result and 'url' in result:
-                result['attempted_sources'] = attempted_sources
-                return result
-            elif result and 'error' in result:
-                errors.append({
-                    'source': source,
-                    'url': headline["url"],
-                    'error': result['error'],
-                    'error_type': result['error_type']
-                })
-        
+                if result and 'url' in result:
+                    # Copy so the cached entry is not tied to this group
+                    return dict(result, attempted_sources=attempted_sources)
+                elif result and 'error' in result:
+                    errors.append({
+                        'source': source,
+                        'url': headline["url"],
+                        'error': result['error'],
+                        'error_type': result['error_type']
+                    })
+        finally:
+            for probe in probes or ():
+                probe.cancel()
+
         # All attempts failed
         return {
             'error': 'Failed to extract image from all attempted sources',
@@ -464,292 +1243,475 @@ class BrutalistReportScraper:
 
     def _normalize_text(self, text):
         """Normalize text for better comparison"""
-        # Convert to lowercase
-        text = text.lower()
-        # Remove punctuation and extra spaces
-        text = re.sub(r"[^\w\s]", " ", text)
-        # Remove extra whitespace
-        text = " ".join(text.split())
-        return text
+        return " ".join(self.normalize_titles([text])[0])
+
+    def normalize_titles(self, titles):
+        """
+        Normalizes a list of titles in one pass and returns each title's
+        words: lowercased, with punctuation turned into word breaks
+        """
+        substitute = self.PUNCTUATION_PATTERN.sub
+        words = [None] * len(titles)
+        ascii_titles = []
+        ascii_positions = []
+        for position, title in enumerate(titles):
+            if title.isascii() and "\n" not in title:
+                ascii_titles.append(title)
+                ascii_positions.append(position)
+            else:
+                words[position] = substitute(" ", title.lower()).split()
+
+        # ASCII titles are lowercased and translated as one newline-joined block
+        block = "\n".join(ascii_titles).lower().encode("ascii")
+        block = block.translate(self.PUNCTUATION_TABLE).decode("ascii")
+        for position, text in zip(ascii_positions, block.split("\n")):
+            words[position] = text.split()
+        return words
+
+    def headline_features(self, titles):
+        """
+        _get_headline_features for a list of titles. Titles missing from the
+        memo are normalized together in one batch.
+        """
+        memo = self._feature_cache
+        features = [memo.get(title) for title in titles]
+        missing = {title: None for title, found in zip(titles, features) if found is None}
+        if not missing:
+            return features
+
+        for title, words in zip(missing, self.normalize_titles(list(missing))):
+            missing[title] = self._tokenize_headline(title, words)
+            memo.put(title, missing[title])
+        return [
+            found if found is not None else missing[title]
+            for title, found in zip(titles, features)
+        ]
 
     def _extract_key_phrases(self, text):
         """Extract meaningful phrases and entities from text"""
-        normalized = self._normalize_text(text)
-        words = normalized.split()
-
-        # Get single important words
-        important_words = []
-        # Get 2-word phrases
-        phrases = []
-
-        stop_words = {
-            "a",
-            "an",
-            "the",
-            "and",
-            "but",
-            "or",
-            "for",
-            "nor",
-            "on",
-            "at",
-            "to",
-            "from",
-            "by",
-            "with",
-            "in",
-            "of",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "can",
-            "could",
-            "will",
-            "would",
-            "shall",
-            "should",
-            "may",
-            "might",
-            "must",
-            "that",
-            "which",
-            "who",
-            "whom",
-            "this",
-            "these",
-            "those",
-            "how",
-            "why",
-            "when",
-            "where",
-            "what",
-            # custom
-            "hn",
-            "nyt",
-            "know",
-            "best",
-            "than",
-            "just",
-            "your",
-            "its",
-            "hint and answers",
-            "you",
-        }
+        features = self._get_headline_features(text)
+        return list(features["important"]), list(features["phrases"])
 
-        # Extract meaningful single words (longer than 2 chars, not stop words)
-        for word in words:
-            if len(word) > 2 and word not in stop_words:
-                important_words.append(word)
+    def _get_headline_features(self, title):
+        """
+        Tokenize a headline once and cache the result by title.
+        The same tokens are reused by similarity scoring and topic naming.
+        """
+        features = self._feature_cache.get(title)
+        if features is None:
+            features = self._tokenize_headline(title, self.normalize_titles([title])[0])
+            self._feature_cache.put(title, features)
+        return features
 
-        # Extract 2-word phrases
-        for i in range(len(words) - 1):
-            if (
-                len(words[i]) > 2
-                and len(words[i + 1]) > 2
-                and words[i] not in stop_words
-                and words[i + 1] not in stop_words
-            ):
-                phrases.append(f"{words[i]} {words[i + 1]}")
+    def _tokenize_headline(self, title, words):
+        """Builds the features of a title from its normalized words"""
+        stop_words = self.STOP_WORDS
 
-        return important_words, phrases
+        # Meaningful single words (longer than 2 chars, not stop words)
+        important = [w for w in words if len(w) > 2 and w not in stop_words]
+
+        # 2-word phrases made of meaningful words
+        phrases = [
+            f"{words[i]} {words[i + 1]}"
+            for i in range(len(words) - 1)
+            if len(words[i]) > 2
+            and len(words[i + 1]) > 2
+            and words[i] not in stop_words
+            and words[i + 1] not in stop_words
+        ]
+
+        lower = title.lower()
+        features = {
+            "words": words,
+            "important": important,
+            "phrases": phrases,
+            "word_set": frozenset(important),
+            "phrase_set": frozenset(phrases),
+            "lower": lower,
+            # Terms from CONFLICTING_PAIRS found anywhere in the raw title
+            "conflict_terms": frozenset(
+                term
+                for pair in self.CONFLICTING_PAIRS
+                for term in pair
+                if term in lower
+            ),
+            # Naming tokens are filled in lazily by _get_naming_tokens
+            "naming": None,
+        }
+        return features
 
     def _calculate_similarity_score(self, text1, text2):
         """Calculate comprehensive similarity score between two texts with stricter grouping"""
-        words1, phrases1 = self._extract_key_phrases(text1)
-        words2, phrases2 = self._extract_key_phrases(text2)
+        return self._score_features(
+            self._get_headline_features(text1), self._get_headline_features(text2)
+        )
+
+    @classmethod
+    def _score_features(cls, features1, features2):
+        """Similarity score between two pre-tokenized headlines"""
+        words1 = features1["word_set"]
+        words2 = features2["word_set"]
 
         # Require at least one phrase match for high similarity
-        phrase_overlap = len(set(phrases1) & set(phrases2))
+        phrase_overlap = len(features1["phrase_set"] & features2["phrase_set"])
         if phrase_overlap == 0:
             # If no phrase overlap, require significant word overlap
-            word_overlap = len(set(words1) & set(words2))
+            word_overlap = len(words1 & words2)
             if word_overlap < 3:  # Stricter requirement
                 return 0
             word_score = word_overlap * 1.5
         else:
             # Phrase matches get high scores
-            word_overlap = len(set(words1) & set(words2))
+            word_overlap = len(words1 & words2)
             word_score = word_overlap * 2
             phrase_score = phrase_overlap * 6  # Higher weight for phrases
             word_score += phrase_score
 
         # Semantic coherence check - penalize if headlines are about different topics
-        # Check for conflicting keywords that suggest different topics
-        conflicting_pairs = [
-            ("election", "sports"),
-            ("politics", "gaming"),
-            ("business", "weather"),
-            ("covid", "entertainment"),
-            ("war", "tech"),
-            ("climate", "fashion"),
-        ]
-
-        text1_lower = text1.lower()
-        text2_lower = text2.lower()
-
-        for pair in conflicting_pairs:
-            if (pair[0] in text1_lower and pair[1] in text2_lower) or (
-                pair[1] in text1_lower and pair[0] in text2_lower
-            ):
-                word_score *= 0.3  # Heavy penalty for conflicting topics
+        terms1 = features1["conflict_terms"]
+        terms2 = features2["conflict_terms"]
+        if terms1 and terms2:
+            for pair in cls.CONFLICTING_PAIRS:
+                if (pair[0] in terms1 and pair[1] in terms2) or (
+                    pair[1] in terms1 and pair[0] in terms2
+                ):
+                    word_score *= 0.3  # Heavy penalty for conflicting topics
 
         # Length penalty to avoid grouping very different length headlines
-        len_diff = abs(len(words1) - len(words2))
+        len_diff = abs(len(features1["important"]) - len(features2["important"]))
         length_penalty = min(len_diff * 0.5, 2)  # Reduced penalty
 
         total_score = word_score - length_penalty
         return max(0, total_score)
 
-    def find_common_headlines(self, news_data, is_topic=False, is_last_week=False):
-        """Identifies headlines common across different sources with improved grouping"""
-        if not news_data or "sources" not in news_data:
-            return []
+    def _build_similarity_graph(self, index, threshold):
+        """
+        Scores every candidate pair of distinct titles once and returns, per
+        title id, the set of title ids scoring at or above `threshold`, or
+        above a higher cutoff if that keeps more than MAX_EDGES_PER_TITLE
+        edges per title (see _similarity_cutoff).
+        Candidates share at least one important word, which any pair with a
+        positive score must, unless that word is too common to be worth
+        indexing (see _candidate_postings). With `self.workers` > 1, row
+        blocks are scored in a process pool and merged back in block order.
 
-        # Set similarity threshold based on context - higher thresholds for stricter grouping
-        if is_topic and is_last_week:
-            similarity_threshold = 12  # Increased
-        elif is_topic:
-            similarity_threshold = 9  # Increased
-        elif is_last_week:
-            similarity_threshold = 14  # Increased
-        else:
-            similarity_threshold = 10  # Increased
+        The graph is kept on the index, so titles added since the last call
+        (e.g. by watch mode) are the only rows that get scored.
+        """
+        if index.graph_threshold != threshold:
+            index.graph_threshold = threshold
+            index.similar = []
+            index.scored = 0
+            index.score_histogram = [0] * self.SCORE_HISTOGRAM_BINS
+            index.edge_bins = [array("i") for _ in range(self.SCORE_HISTOGRAM_BINS)]
+            index.cutoff = None
 
-        # Flatten all headlines
-        all_headlines = []
-        for source, headlines in news_data["sources"].items():
-            for headline in headlines:
-                all_headlines.append(
-                    {
-                        "source": source,
-                        "title": headline["title"],
-                        "url": headline["url"],
-                        "time": headline.get("time"),
-                        "source_link": headline.get("source_link"),
-                    }
-                )
+        features = index.features
+        new_from = index.scored
+        if new_from == len(features):
+            return index.similar
 
-        total_headlines = len(all_headlines)
-        self.update_progress(
-            json.dumps(
-                {
-                    "status": "progress",
-                    "message": "Starting headline analysis...",
-                    "processed": 0,
-                    "total": total_headlines,
-                }
-            )
-        )
+        self._record_document_frequencies(index)
+        if index.common_terms is None:
+            index.common_terms = self._common_terms()
+            self.metrics.inc("brutalist_common_terms", len(index.common_terms))
+        postings, terms = self._candidate_postings(index)
 
-        common_topics = []
-        processed_headlines = set()
+        # Only what the scorer needs is shipped to worker processes
+        scoring_features = [
+            {
+                "words": words,
+                "phrases": phrases,
+                "word_set": f["word_set"],
+                "phrase_set": f["phrase_set"],
+                "important": f["important"],
+                "conflict_terms": f["conflict_terms"],
+            }
+            for f, (words, phrases) in zip(features, terms)
+        ]
 
-        # Compare headlines with improved similarity scoring
-        for i, headline1 in enumerate(all_headlines, 1):
-            if headline1["title"] in processed_headlines:
-                self.update_progress(
-                    json.dumps(
-                        {
-                            "status": "progress",
-                            "message": "Analyzing headlines...",
-                            "processed": i,
-                            "total": total_headlines,
-                        }
+        new_rows = len(features) - new_from
+        if self.workers > 1 and new_rows >= self.PARALLEL_MIN_TITLES:
+            # Rows near the start have the most candidates, so use many small
+            # blocks to keep workers evenly loaded
+            block_size = max(1, new_rows // (self.workers * 16))
+            starts = range(new_from, len(features), block_size)
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_scoring_worker,
+                initargs=(scoring_features, postings, threshold),
+            )
+            blocks = []
+            try:
+                for block in executor.map(
+                    _score_worker_block,
+                    starts,
+                    [min(start + block_size, len(features)) for start in starts],
+                    [new_from] * len(starts),
+                ):
+                    self._check_cancelled()
+                    blocks.append(block)
+            finally:
+                executor.shutdown(wait=not self.cancelled, cancel_futures=True)
+        else:
+            blocks = []
+            for start in range(new_from, len(features), self.SCORING_BLOCK_ROWS):
+                self._check_cancelled()
+                end = min(start + self.SCORING_BLOCK_ROWS, len(features))
+                blocks.append(
+                    _score_row_block(
+                        scoring_features, postings, threshold, start, end, new_from
                     )
                 )
-                continue
 
-            similar_headlines = []
+        histogram = index.score_histogram
+        scored_pairs = 0
+        bounded_pairs = 0
+        edges = 0
+        for block, block_histogram, block_bounded in blocks:
+            for score_bin, count in enumerate(block_histogram):
+                histogram[score_bin] += count
+            scored_pairs += sum(block_histogram)
+            bounded_pairs += block_bounded
+            edges += len(block)
+        index.scored = len(features)
 
-            for headline2 in all_headlines:
-                if headline1["title"] == headline2["title"]:
-                    continue
+        similar_titles = index.similar
+        similar_titles.extend(set() for _ in range(new_rows))
+        cutoff = self._similarity_cutoff(histogram, threshold, len(features))
+        rebuild = cutoff != index.cutoff
+        index.cutoff = cutoff
 
-                if headline2["title"] in processed_headlines:
-                    continue
+        # Edges are kept by score bin so a later cutoff can re-filter them
+        edge_bins = index.edge_bins
+        for block, _, _ in blocks:
+            for i, j, score_bin in block:
+                edge_bins[score_bin].extend((i, j))
+                if not rebuild and score_bin >= cutoff:
+                    similar_titles[i].add(j)
+                    similar_titles[j].add(i)
+        if rebuild:
+            for similar in similar_titles:
+                similar.clear()
+            for pairs in edge_bins[cutoff:]:
+                for i, j in zip(pairs[::2], pairs[1::2]):
+                    similar_titles[i].add(j)
+                    similar_titles[j].add(i)
 
-                # Calculate similarity score
-                similarity_score = self._calculate_similarity_score(
-                    headline1["title"], headline2["title"]
+        if cutoff > threshold:
+            found = sum(histogram[math.floor(threshold) :])
+            kept = sum(histogram[cutoff:])
+            self.update_progress(
+                json.dumps(
+                    {
+                        "status": "progress",
+                        "message": f"Keeping the {kept} strongest of {found} similar pairs (score cutoff {cutoff})",
+                    }
                 )
+            )
 
-                if similarity_score >= similarity_threshold:
-                    if not similar_headlines:
-                        similar_headlines.append(
-                            {
-                                "source": headline1["source"],
-                                "title": headline1["title"],
-                                "url": headline1["url"],
-                                "time": headline1.get("time"),
-                                "source_link": headline1.get("source_link"),
-                            }
-                        )
+        # Every new row pairs with the later rows and all previously scored ones
+        possible_pairs = new_rows * (new_rows - 1) // 2 + new_rows * new_from
+        self.metrics.inc("brutalist_similarity_pairs", scored_pairs, outcome="scored")
+        self.metrics.inc("brutalist_similarity_pairs", bounded_pairs, outcome="bounded")
+        self.metrics.inc(
+            "brutalist_similarity_pairs",
+            possible_pairs - scored_pairs - bounded_pairs,
+            outcome="pruned",
+        )
+        self.metrics.inc("brutalist_similarity_edges", edges)
+        return similar_titles
 
-                    similar_headlines.append(
-                        {
-                            "source": headline2["source"],
-                            "title": headline2["title"],
-                            "url": headline2["url"],
-                            "time": headline2.get("time"),
-                            "source_link": headline2.get("source_link"),
-                        }
+    def _similarity_cutoff(self, histogram, threshold, titles):
+        """
+        The lowest score bin kept in the similarity graph: the threshold's
+        own bin, raised until the pairs in the kept bins fit within
+        MAX_EDGES_PER_TITLE per title. The top bin is always kept.
+        """
+        budget = self.MAX_EDGES_PER_TITLE * titles
+        cutoff = len(histogram) - 1
+        kept = histogram[cutoff]
+        while cutoff > math.floor(threshold) and kept + histogram[cutoff - 1] <= budget:
+            cutoff -= 1
+            kept += histogram[cutoff]
+        return cutoff
+
+    def _record_document_frequencies(self, index):
+        """
+        Counts the words and phrases of titles added to `index` since the
+        last call. Only done when pruning is enabled with `max_df`.
+        """
+        if self.doc_freq is None or self.max_df is None or index.recorded == len(index):
+            return
+        term_name = index.term_name
+        self.doc_freq.record(
+            (
+                index.title_text(title_id),
+                [term_name(term) for term in f["word_set"] | f["phrase_set"]],
+            )
+            for title_id, f in enumerate(index.features[index.recorded :], index.recorded)
+        )
+        index.recorded = len(index)
+        self.doc_freq.save()
+
+    def _common_terms(self):
+        """Words and phrases found in more than `max_df` of all counted titles"""
+        if self.doc_freq is None or self.max_df is None:
+            return frozenset()
+        return self.doc_freq.common_terms(self.max_df, self.DF_MIN_DOCUMENTS)
+
+    def _candidate_postings(self, index):
+        """
+        Returns (postings, terms): the inverted index used to generate
+        candidate pairs and, per title id, the (words, phrases) to look it
+        up with. Words in `index.common_terms` are left
+        out so their huge posting lists are never merged. A pair that shares
+        only a common word can still be matched through a shared phrase
+        containing it, so such phrases are indexed in its place unless they
+        are common too.
+        """
+        common = index.common_terms
+        if not common:
+            return index.postings, [(f["word_set"], ()) for f in index.features]
+
+        term_name = index.term_name
+        postings = {
+            term: posting
+            for term, posting in index.postings.items()
+            if term_name(term) not in common
+        }
+        needed_phrases = {}
+        terms = []
+        for title_id, f in enumerate(index.features):
+            words = [term for term in f["word_set"] if term in postings]
+            phrases = []
+            for phrase in f["phrase_set"]:
+                needed = needed_phrases.get(phrase)
+                if needed is None:
+                    name = term_name(phrase)
+                    needed = name not in common and any(
+                        word in common for word in name.split(" ")
                     )
+                    needed_phrases[phrase] = needed
+                if needed:
+                    postings.setdefault(phrase, []).append(title_id)
+                    phrases.append(phrase)
+            terms.append((words, phrases))
+        return postings, terms
 
-            # Process similar headlines with stricter requirements
-            if similar_headlines and len(similar_headlines) >= self.min_group_size:
-                sources = {h["source"] for h in similar_headlines}
-                # Require at least 3 different sources for better validation
-                if len(sources) >= 3:
-                    topic_name = self.generate_topic_name(similar_headlines)
+    def find_common_headlines(
+        self, news_data, is_topic=False, is_last_week=False, group_cache=None, top_k=None
+    ):
+        """
+        Identifies headlines common across different sources with improved grouping.
+        `group_cache` maps a group's (source, title, url) members to its name
+        and image, so unchanged groups are not re-named or re-fetched.
+        With `top_k`, only the K largest groups are assembled (see
+        _assemble_top_groups).
+        """
+        if not news_data or "sources" not in news_data:
+            return []
 
-                    # Skip if topic name is too generic or too short
-                    if len(topic_name.split()) >= 2 and not self._is_generic_topic(
-                        topic_name
-                    ):
-                        topic_data = {
-                            "id": len(common_topics) + 1,
-                            "topic_name": topic_name,
-                            "count": len(similar_headlines),
-                            "sources_count": len(sources),
-                            "headlines": similar_headlines,
-                        }
+        # Flatten all headlines as (source, headline) pairs
+        all_headlines = [
+            (source, headline)
+            for source, headlines in news_data["sources"].items()
+            for headline in headlines
+        ]
 
-                        # =====================================================================
-                        # EXPERIMENTAL FEATURE: Extract image from multiple articles in the group
-                        # If you want to remove this feature, delete this code block
-                        # =====================================================================
-                        try:
-                            image_result = self.extract_images_from_group(
-                                similar_headlines, topic_name
-                            )
-                            # Always add image data, whether successful or failed
-                            topic_data["image"] = image_result
-                        except Exception as e:
-                            # Fallback error handling
-                            topic_data["image"] = {
-                                "error": f"Unexpected error during image extraction: {str(e)}",
-                                "error_type": "UnexpectedError",
-                                "attempted_sources": [],
-                                "total_attempts": 0,
-                            }
-                        # =====================================================================
-                        # END OF EXPERIMENTAL FEATURE
-                        # =====================================================================
+        # Tokenize each distinct title once (streamed scrapes arrive with the
+        # index already built); scoring and naming reuse these tokens
+        index = news_data.get("_index")
+        if index is None:
+            index = HeadlineIndex(self)
+        headline_title_ids = index.add_many([headline["title"] for _, headline in all_headlines])
+
+        return self._group_headlines(
+            all_headlines,
+            headline_title_ids,
+            index,
+            self._similarity_threshold(is_topic, is_last_week),
+            group_cache,
+            top_k,
+        )
+
+    def _similarity_threshold(self, is_topic, is_last_week):
+        """Minimum pair score for grouping in the given context"""
+        key = "topic" if is_topic else "general"
+        if is_last_week:
+            key += "_last_week"
+        return self.similarity_thresholds[key]
+
+    def _group_headlines(
+        self, all_headlines, headline_title_ids, index, threshold, group_cache=None, top_k=None
+    ):
+        """
+        Groups flattened (source, headline) pairs whose titles were added to
+        `index` as `headline_title_ids`, and returns the sorted groups.
+        `all_headlines` only needs len() and indexing, so it may build
+        headlines lazily.
+        """
+        # Positions of every headline sharing a title, in flattened order
+        positions_by_title = [[] for _ in range(len(index))]
+        for position, title_id in enumerate(headline_title_ids):
+            positions_by_title[title_id].append(position)
+
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "progress",
+                    "message": f"Scoring {len(index)} distinct headlines...",
+                }
+            )
+        )
+        similar_titles = self._build_similarity_graph(index, threshold)
+
+        grouping = _Grouping(all_headlines, headline_title_ids, positions_by_title, similar_titles)
+        if top_k:
+            groups = self._assemble_top_groups(grouping, top_k, group_cache)
+        else:
+            groups = self._assemble_groups(grouping, group_cache)
+
+        common_topics = []
+        for topic_data, cached_group in groups:
+            if self.extract_images:
+                self._attach_group_image(topic_data, cached_group)
+            common_topics.append(topic_data)
+
+        # Sort by size
+        common_topics.sort(key=lambda x: x["count"], reverse=True)
 
-                        common_topics.append(topic_data)
+        # Re-assign IDs
+        for i, topic in enumerate(common_topics, 1):
+            topic["id"] = i
+
+        return common_topics
+
+    def _assemble_groups(self, grouping, group_cache=None):
+        """
+        Grows a group around each unprocessed headline in flattened order.
+        Returns (topic_data, cached_group) for every accepted group.
+        """
+        all_headlines = grouping.all_headlines
+        total_headlines = len(all_headlines)
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "progress",
+                    "message": "Starting headline analysis...",
+                    "processed": 0,
+                    "total": total_headlines,
+                }
+            )
+        )
 
-                        for headline in similar_headlines:
-                            processed_headlines.add(headline["title"])
+        groups = []
+        for i in range(1, total_headlines + 1):
+            self._check_cancelled()
+            if grouping.headline_title_ids[i - 1] not in grouping.processed_titles:
+                group = self._build_group(grouping, i - 1, len(groups) + 1, group_cache)
+                if group is not None:
+                    groups.append(group)
 
             self.update_progress(
                 json.dumps(
@@ -761,15 +1723,202 @@ class BrutalistReportScraper:
                     }
                 )
             )
+        return groups
 
-        # Sort by size
-        common_topics.sort(key=lambda x: x["count"], reverse=True)
+    def _assemble_top_groups(self, grouping, top_k, group_cache=None):
+        """
+        Assembles only the `top_k` largest groups. Each title's group size is
+        bounded by its graph neighbours' headline counts; seeds are taken
+        largest bound first and a popped bound is re-checked against titles
+        grouped since, so groups are accepted in non-increasing size and the
+        search stops once K are found or no seed can still form a group.
+        """
+        positions_by_title = grouping.positions_by_title
+        similar_titles = grouping.similar_titles
+        processed_titles = grouping.processed_titles
 
-        # Re-assign IDs
-        for i, topic in enumerate(common_topics, 1):
-            topic["id"] = i
+        def group_size(title_id):
+            members = [t for t in similar_titles[title_id] if t not in processed_titles]
+            if not members:
+                return 0
+            return 1 + sum(len(positions_by_title[t]) for t in members)
 
-        return common_topics
+        # Titles indexed in earlier watch refreshes may have no headlines now
+        seeds = [
+            (-group_size(title_id), positions[0], title_id)
+            for title_id, positions in enumerate(positions_by_title)
+            if positions
+        ]
+        heapq.heapify(seeds)
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "progress",
+                    "message": f"Finding the {top_k} largest groups...",
+                    "processed": 0,
+                    "total": len(seeds),
+                }
+            )
+        )
+
+        groups = []
+        examined = 0
+        while seeds and len(groups) < top_k:
+            self._check_cancelled()
+            bound, position, title_id = heapq.heappop(seeds)
+            if -bound < self.min_group_size:
+                break
+            if title_id in processed_titles:
+                continue
+            size = group_size(title_id)
+            if size < -bound:
+                heapq.heappush(seeds, (-size, position, title_id))
+                continue
+
+            examined += 1
+            group = self._build_group(grouping, position, len(groups) + 1, group_cache)
+            if group is not None:
+                groups.append(group)
+            self.update_progress(
+                json.dumps(
+                    {
+                        "status": "progress",
+                        "message": f"Found {len(groups)} of {top_k} groups...",
+                        "processed": examined,
+                        "total": examined + len(seeds),
+                    }
+                )
+            )
+
+        self.metrics.inc("brutalist_groups", len(seeds), outcome="skipped_top_k")
+        return groups
+
+    def _build_group(self, grouping, position1, group_id, group_cache=None):
+        """
+        Builds the group seeded by the headline at `position1` from its
+        unprocessed graph neighbours. Returns (topic_data, cached_group) and
+        marks its titles processed if it passes the size, source and name
+        rules, otherwise None.
+        """
+        all_headlines = grouping.all_headlines
+        headline_title_ids = grouping.headline_title_ids
+        processed_titles = grouping.processed_titles
+        source1, headline1 = all_headlines[position1]
+        title_id1 = headline_title_ids[position1]
+
+        # Every headline whose title scored above the threshold, in order
+        member_positions = sorted(
+            position
+            for title_id2 in grouping.similar_titles[title_id1]
+            if title_id2 not in processed_titles
+            for position in grouping.positions_by_title[title_id2]
+        )
+        if not member_positions:
+            return None
+
+        similar_headlines = [
+            {
+                "source": source1,
+                "title": headline1["title"],
+                "url": headline1["url"],
+                "time": headline1.get("time"),
+                "source_link": headline1.get("source_link"),
+            }
+        ]
+        for position in member_positions:
+            source2, headline2 = all_headlines[position]
+            similar_headlines.append(
+                {
+                    "source": source2,
+                    "title": headline2["title"],
+                    "url": headline2["url"],
+                    "time": headline2.get("time"),
+                    "source_link": headline2.get("source_link"),
+                }
+            )
+
+        # Process similar headlines with stricter requirements
+        if len(similar_headlines) < self.min_group_size:
+            self.metrics.inc("brutalist_groups", outcome="too_small")
+            return None
+        sources = {h["source"] for h in similar_headlines}
+        # Require at least 3 different sources for better validation
+        if len(sources) < 3:
+            self.metrics.inc("brutalist_groups", outcome="too_few_sources")
+            return None
+
+        cached_group = None
+        if group_cache is not None:
+            group_key = tuple((h["source"], h["title"], h["url"]) for h in similar_headlines)
+            cached_group = group_cache.pop(group_key, None)
+            self.metrics.inc(
+                "brutalist_cache_requests",
+                cache="group",
+                result="miss" if cached_group is None else "hit",
+            )
+            if cached_group is None:
+                cached_group = {"topic_name": self.generate_topic_name(similar_headlines)}
+            # Re-insert so the most recently used groups are kept last
+            group_cache[group_key] = cached_group
+            topic_name = cached_group["topic_name"]
+        else:
+            topic_name = self.generate_topic_name(similar_headlines)
+
+        # Skip if topic name is too generic or too short
+        if len(topic_name.split()) < 2:
+            self.metrics.inc("brutalist_groups", outcome="short_name")
+            return None
+        if self._is_generic_topic(topic_name):
+            self.metrics.inc("brutalist_groups", outcome="generic_name")
+            return None
+
+        processed_titles.add(title_id1)
+        for position in member_positions:
+            processed_titles.add(headline_title_ids[position])
+        self.metrics.inc("brutalist_groups", outcome="formed")
+
+        topic_data = {
+            "id": group_id,
+            "topic_name": topic_name,
+            "count": len(similar_headlines),
+            "sources_count": len(sources),
+            "headlines": similar_headlines,
+        }
+        return topic_data, cached_group
+
+    def _attach_group_image(self, topic_data, cached_group=None):
+        """Adds the group's image (or extraction error) to `topic_data`"""
+        # =====================================================================
+        # EXPERIMENTAL FEATURE: Extract image from multiple articles in the group
+        # If you want to remove this feature, delete this code block
+        # =====================================================================
+        try:
+            if cached_group and "image" in cached_group:
+                image_result = cached_group["image"]
+            else:
+                with self._timed_stage("images"):
+                    image_result = self.extract_images_from_group(
+                        topic_data["headlines"], topic_data["topic_name"]
+                    )
+                # Deadline misses are retried on the next refresh
+                if (
+                    cached_group is not None
+                    and image_result.get("error_type") != "DeadlineExceeded"
+                ):
+                    cached_group["image"] = image_result
+            # Always add image data, whether successful or failed
+            topic_data["image"] = image_result
+        except Exception as e:
+            # Fallback error handling
+            topic_data["image"] = {
+                "error": f"Unexpected error during image extraction: {str(e)}",
+                "error_type": "UnexpectedError",
+                "attempted_sources": [],
+                "total_attempts": 0,
+            }
+        # =====================================================================
+        # END OF EXPERIMENTAL FEATURE
+        # =====================================================================
 
     def _is_generic_topic(self, topic_name):
         """Check if a topic name is too generic"""
@@ -786,221 +1935,151 @@ class BrutalistReportScraper:
         topic_lower = topic_name.lower()
         return any(generic in topic_lower for generic in generic_terms)
 
-    def generate_topic_name(self, headlines):
-        """Enhanced topic name generation with better insight extraction"""
-        stop_words = {
-            "a",
-            "an",
-            "the",
-            "and",
-            "but",
-            "or",
-            "for",
-            "nor",
-            "on",
-            "at",
-            "to",
-            "from",
-            "by",
-            "with",
-            "in",
-            "of",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "can",
-            "could",
-            "will",
-            "would",
-            "shall",
-            "should",
-            "may",
-            "might",
-            "must",
-            "that",
-            "which",
-            "who",
-            "whom",
-            "this",
-            "these",
-            "those",
-            "how",
-            "why",
-            "when",
-            "where",
-            "what",
-            # custom
-            "hn",
-            "nyt",
-            "know",
-            "best",
-            "than",
-            "just",
-            "your",
-            "its",
-            "hint and answers",
-            "you",
-        }
+    def _get_naming_tokens(self, title):
+        """
+        Topic-naming tokens for a headline, cached alongside its similarity
+        features so a title is only tokenized once per process.
+        """
+        features = self._get_headline_features(title)
+        naming = features["naming"]
+        if naming is not None:
+            return naming
 
-        # Extract specific entities and key terms
-        all_entities = []
-        all_important_phrases = []
-        all_keywords = []
+        stop_words = self.STOP_WORDS
+        words = features["words"]
 
-        for headline in headlines:
-            title = headline["title"]
-            normalized = self._normalize_text(title)
-            words = normalized.split()
+        # Entities (capitalized words from original)
+        entities = []
+        for word in title.split():
+            clean_word = re.sub(r"[^\w]", "", word)
+            if (
+                len(clean_word) > 2
+                and word[0].isupper()
+                and clean_word.lower() not in stop_words
+            ):
+                entities.append(clean_word)
 
-            # Extract entities (capitalized words from original)
-            original_words = title.split()
-            for word in original_words:
-                clean_word = re.sub(r"[^\w]", "", word)
-                if (
-                    len(clean_word) > 2
-                    and word[0].isupper()
-                    and clean_word.lower() not in stop_words
-                ):
-                    all_entities.append(clean_word)
+        # Meaningful 3-4 word phrases
+        phrases3 = []
+        phrases4 = []
+        for i in range(len(words) - 2):
+            if (
+                len(words[i]) > 2
+                and len(words[i + 1]) > 2
+                and len(words[i + 2]) > 2
+                and words[i] not in stop_words
+                and words[i + 1] not in stop_words
+                and words[i + 2] not in stop_words
+            ):
+                phrase = f"{words[i]} {words[i + 1]} {words[i + 2]}"
+                phrases3.append(phrase)
 
-            # Extract meaningful 3-4 word phrases
-            for i in range(len(words) - 2):
                 if (
-                    len(words[i]) > 2
-                    and len(words[i + 1]) > 2
-                    and len(words[i + 2]) > 2
-                    and words[i] not in stop_words
-                    and words[i + 1] not in stop_words
-                    and words[i + 2] not in stop_words
+                    i < len(words) - 3
+                    and len(words[i + 3]) > 2
+                    and words[i + 3] not in stop_words
                 ):
-                    phrase = f"{words[i]} {words[i + 1]} {words[i + 2]}"
-                    all_important_phrases.append(phrase)
-
-                    # Also try 4-word phrases
-                    if (
-                        i < len(words) - 3
-                        and len(words[i + 3]) > 2
-                        and words[i + 3] not in stop_words
-                    ):
-                        phrase4 = f"{phrase} {words[i + 3]}"
-                        all_important_phrases.append(phrase4)
+                    phrases4.append(f"{phrase} {words[i + 3]}")
 
-            # Extract important keywords (non-stop words)
-            for word in words:
-                if word not in stop_words and len(word) > 2:
-                    all_keywords.append(word)
+        # Action words or descriptive terms (matched against the raw title)
+        actions = []
+        for word in features["lower"].split():
+            clean_word = re.sub(r"[^\w]", "", word)
+            if (
+                clean_word not in stop_words
+                and len(clean_word) > 3
+                and any(action in clean_word for action in self.ACTION_WORDS)
+            ):
+                actions.append(clean_word)
 
-        # Count frequencies
-        entity_counter = Counter(all_entities)
-        phrase_counter = Counter(all_important_phrases)
-        keyword_counter = Counter(all_keywords)
+        naming = {
+            "entities": entities,
+            "phrases3": phrases3,
+            "phrases4": phrases4,
+            "actions": actions,
+        }
+        features["naming"] = naming
+        return naming
 
-        # Minimum frequency threshold
-        min_freq = max(2, len(headlines) // 4)
+    def generate_topic_name(self, headlines):
+        """
+        Enhanced topic name generation with better insight extraction.
+        Reuses cached headline tokens and builds every counter in one pass.
+        """
+        entity_counter = Counter()
+        phrase3_counter = Counter()
+        phrase4_counter = Counter()
+        keyword_counter = Counter()
+        group_tokens = []
 
-        # Try longer phrases first (4+ words) that appear frequently
-        long_phrases = [
-            (phrase, count)
-            for phrase, count in phrase_counter.most_common()
-            if count >= min_freq and len(phrase.split()) >= 4
-        ]
+        for headline in headlines:
+            title = headline["title"]
+            features = self._get_headline_features(title)
+            naming = self._get_naming_tokens(title)
+            group_tokens.append((features, naming))
 
-        if long_phrases:
-            return long_phrases[0][0].title()
+            entity_counter.update(naming["entities"])
+            phrase3_counter.update(naming["phrases3"])
+            phrase4_counter.update(naming["phrases4"])
+            keyword_counter.update(features["important"])
 
-        # Try 3-word phrases
-        medium_phrases = [
-            (phrase, count)
-            for phrase, count in phrase_counter.most_common()
-            if count >= min_freq and len(phrase.split()) == 3
-        ]
+        # Minimum frequency threshold
+        min_freq = max(2, len(headlines) // 4)
 
-        if medium_phrases:
-            return medium_phrases[0][0].title()
+        # Try longer phrases first (4+ words) that appear frequently, then
+        # 3-word phrases. max() keeps the first of equal counts, matching
+        # Counter.most_common() ordering.
+        for phrase_counter in (phrase4_counter, phrase3_counter):
+            if phrase_counter:
+                phrase, count = max(phrase_counter.items(), key=lambda item: item[1])
+                if count >= min_freq:
+                    return phrase.title()
 
         # Try entity + keyword combinations
-        common_entities = [
-            (entity, count)
-            for entity, count in entity_counter.most_common()
-            if count >= min_freq
-        ]
+        entity = None
+        if entity_counter:
+            top_entity, count = max(entity_counter.items(), key=lambda item: item[1])
+            if count >= min_freq:
+                entity = top_entity
         common_keywords = [
             (keyword, count)
             for keyword, count in keyword_counter.most_common()
             if count >= min_freq
         ]
 
-        if common_entities and common_keywords:
-            entity = common_entities[0][0]
+        if entity and common_keywords:
+            entity_lower = entity.lower()
             # Find a keyword that's not just the entity in lowercase
             for keyword, _ in common_keywords:
-                if keyword.lower() != entity.lower():
+                if keyword.lower() != entity_lower:
                     # Try to find context words that appear with this entity
-                    context_words = []
-                    for headline in headlines:
-                        if entity.lower() in headline["title"].lower():
-                            words = self._normalize_text(headline["title"]).split()
-                            for word in words:
-                                if (
-                                    word != entity.lower()
-                                    and word not in stop_words
-                                    and len(word) > 2
-                                    and word in [k for k, _ in common_keywords[:5]]
-                                ):
-                                    context_words.append(word)
-
-                    if context_words:
-                        context_counter = Counter(context_words)
+                    top_keywords = {k for k, _ in common_keywords[:5]}
+                    context_counter = Counter()
+                    for features, _ in group_tokens:
+                        if entity_lower in features["lower"]:
+                            context_counter.update(
+                                word
+                                for word in features["important"]
+                                if word != entity_lower and word in top_keywords
+                            )
+
+                    if context_counter:
                         best_context = context_counter.most_common(1)[0][0]
                         return f"{entity} {best_context.title()}"
                     else:
                         return f"{entity} {keyword.title()}"
 
         # Try just the most common entity with descriptive context
-        if common_entities:
-            entity = common_entities[0][0]
-            # Look for action words or descriptive terms
-            action_words = []
-            for headline in headlines:
-                if entity.lower() in headline["title"].lower():
-                    words = headline["title"].lower().split()
-                    for word in words:
-                        clean_word = re.sub(r"[^\w]", "", word)
-                        if (
-                            clean_word not in stop_words
-                            and len(clean_word) > 3
-                            and clean_word != entity.lower()
-                            and any(
-                                action in clean_word
-                                for action in [
-                                    "announce",
-                                    "launch",
-                                    "report",
-                                    "reveal",
-                                    "update",
-                                    "plan",
-                                    "face",
-                                    "deal",
-                                    "issue",
-                                    "problem",
-                                    "crisis",
-                                ]
-                            )
-                        ):
-                            action_words.append(clean_word)
+        if entity:
+            entity_lower = entity.lower()
+            action_counter = Counter()
+            for features, naming in group_tokens:
+                if entity_lower in features["lower"]:
+                    action_counter.update(
+                        word for word in naming["actions"] if word != entity_lower
+                    )
 
-            if action_words:
-                action_counter = Counter(action_words)
+            if action_counter:
                 best_action = action_counter.most_common(1)[0][0]
                 return f"{entity} {best_action.title()}"
 
@@ -1022,94 +2101,2255 @@ class BrutalistReportScraper:
 
     def update_progress(self, message):
         """Updates progress information"""
-        print(message, flush=True)
+        with self._output_lock:
+            print(message, flush=True)
 
-    def run(self, topic=None, last_week=False):
-        """Main entry point to run the scraper"""
-        if topic and topic not in self.AVAILABLE_TOPICS:
-            print(
-                json.dumps(
-                    {
-                        "status": "error",
-                        "message": f"Invalid topic. Available topics: {', '.join(self.AVAILABLE_TOPICS)}",
-                    }
+    def _analyze(self, news_data, topic, last_week, group_cache=None):
+        """Groups scraped headlines and builds the result for one topic"""
+        # Store topic information
+        if topic:
+            news_data["topic"] = topic
+        index = news_data.setdefault("_index", HeadlineIndex(self))
+
+        # Identical input and settings always produce the same groups
+        cache_key = None
+        common_topics = None
+        cache_status = "disabled"
+        if self.result_cache is not None:
+            cache_key = self._result_cache_key(news_data, bool(topic), last_week)
+            common_topics = self.result_cache.get(self._result_cache_entry(cache_key, index))
+            cache_status = "hit" if common_topics is not None else "miss"
+            self.metrics.inc("brutalist_cache_requests", cache="result", result=cache_status)
+
+        # Clustering and image time is reported per topic
+        self._stage_times.pop("clustering", None)
+        self._stage_times.pop("images", None)
+
+        # Find common headlines
+        if common_topics is None:
+            with self._timed_stage("clustering"):
+                common_topics = self.find_common_headlines(
+                    news_data,
+                    is_topic=bool(topic),
+                    is_last_week=last_week,
+                    group_cache=group_cache,
+                    top_k=self.top_k,
                 )
+            # Results degraded by the deadline (at any stage of the run,
+            # including earlier topics of a batch) are not cached
+            degraded = self._exceeded_stages or any(
+                group.get("image", {}).get("error_type") == "DeadlineExceeded"
+                for group in common_topics
             )
-            return
+            if cache_key and not degraded:
+                # Stored under the common terms the grouping actually used
+                self.result_cache.put(self._result_cache_entry(cache_key, index), common_topics)
 
-        try:
-            # Scrape data
-            if last_week:
-                news_data = self.scrape_last_week(topic)
-            else:
-                news_data = self.scrape_today(topic)
+        return self._build_result(
+            common_topics,
+            news_data.get("date_range", datetime.now().strftime("%Y-%m-%d")),
+            news_data.get("topic", "all"),
+            last_week,
+            cache_status,
+        )
 
-            if not news_data or not news_data.get("sources"):
-                print(
-                    json.dumps(
-                        {
-                            "status": "error",
-                            "message": "No data found. Please check your internet connection and try again.",
-                        }
-                    )
-                )
-                return
+    def _build_result(self, common_topics, date, topic, last_week, cache_status):
+        """The final result for one analyzed topic"""
+        result = {
+            "date": date,
+            "topic": topic,
+            "is_last_week": last_week,
+            "common_topics": common_topics,
+            "total_groups": len(common_topics),
+            "total_headlines": sum(
+                group.get("count", len(group["headlines"])) for group in common_topics
+            ),
+            "cache_status": cache_status,
+            "timings": self._run_timings(),
+        }
+        if self.top_k:
+            result["top_k"] = self.top_k
+        if self.deadline is not None:
+            result["deadline"] = {
+                "seconds": self.deadline,
+                "exceeded": list(self._exceeded_stages),
+                "partial": bool(self._exceeded_stages),
+            }
+        return result
 
-            # Store topic information
-            if topic:
-                news_data["topic"] = topic
+    def analyze_archive(self, archive, topic=None, dates=None):
+        """
+        Groups archived headlines of `topic` for the `before` dates in
+        `dates` (newest first) straight from the archive's precomputed
+        features. Headline dicts are only built for the groups assembled.
+        Returns None if none of the pages are archived.
+        """
+        rows = archive.select_rows(topic or "all", dates or self._last_week_dates())
+        if not rows:
+            return None
 
-            # Find common headlines
-            common_topics = self.find_common_headlines(
-                news_data, is_topic=bool(topic), is_last_week=last_week
-            )
+        # Flatten like an aggregated scrape: sources in order of appearance
+        source_column = archive.column("source")
+        rows_by_source = {}
+        for row in rows:
+            rows_by_source.setdefault(source_column[row], []).append(row)
+        rows = [row for source_rows in rows_by_source.values() for row in source_rows]
 
-            # Prepare result
-            result = {
-                "date": news_data.get(
-                    "date_range", datetime.now().strftime("%Y-%m-%d")
-                ),
-                "topic": news_data.get("topic", "all"),
-                "is_last_week": last_week,
-                "common_topics": common_topics,
-                "total_groups": len(common_topics),
-                "total_headlines": sum(
-                    group.get("count", len(group["headlines"]))
-                    for group in common_topics
-                ),
-            }
+        title_column = archive.column("title")
+        index = ArchiveIndex(self, archive)
+        headline_title_ids = [index.add_archived(title_column[row]) for row in rows]
 
-            # Output final result as JSON
-            print(json.dumps(result))
+        return self._group_headlines(
+            _ArchivedHeadlines(archive, rows),
+            headline_title_ids,
+            index,
+            self._similarity_threshold(bool(topic), True),
+            top_k=self.top_k,
+        )
 
-        except Exception as e:
-            print(json.dumps({"status": "error", "message": str(e)}))
+    def _result_cache_key(self, news_data, is_topic, is_last_week):
+        """Hash of the aggregated sources plus every setting that shapes grouping"""
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps(
+                {
+                    "version": self.RESULT_CACHE_VERSION,
+                    "thresholds": self.similarity_thresholds,
+                    "min_group_size": self.min_group_size,
+                    "top_k": self.top_k,
+                    "max_df": self.max_df,
+                    "images": self.extract_images,
+                    # Probing only changes the images stored in a result
+                    "probe_images": self.probe_images and self.extract_images,
+                    "is_topic": is_topic,
+                    "is_last_week": is_last_week,
+                }
+            ).encode("utf-8")
+        )
+        # Source and headline order matter to grouping, so they are hashed
+        # as-is, one source at a time to avoid serializing the whole window
+        for source, headlines in news_data["sources"].items():
+            digest.update(json.dumps([source, headlines]).encode("utf-8"))
+        return digest.hexdigest()
 
+    def _result_cache_entry(self, cache_key, index):
+        """
+        `cache_key` extended with the terms left out of candidate generation
+        for `index`: the ones fixed at its first scoring, or else the ones
+        the next scoring would use. They change as the frequency table
+        fills, so a result grouped with other common terms is never served.
+        """
+        common_terms = index.common_terms
+        if common_terms is None:
+            common_terms = self._common_terms()
+        if not common_terms:
+            return cache_key
+        digest = hashlib.sha256(cache_key.encode("utf-8"))
+        digest.update(json.dumps(sorted(common_terms)).encode("utf-8"))
+        return digest.hexdigest()
 
-def main():
-    """Command-line interface for the Brutalist Report Scraper"""
-    parser = argparse.ArgumentParser(description="Enhanced Brutalist Report Scraper")
-    parser.add_argument(
-        "--topic",
-        choices=BrutalistReportScraper.AVAILABLE_TOPICS,
-        help="Filter by topic (tech, news, business, science, gaming, culture, politics, sports)",
-    )
-    parser.add_argument(
-        "--last-week",
-        action="store_true",
-        help="Scrape last week's headlines instead of today's",
-    )
+    def compact_result(self, result):
+        """
+        Returns `result` with every headline stored once in a table. Group
+        headlines become row indexes; rows follow `headline_fields`, with the
+        source given as an index into the `sources` table.
+        """
+        sources = []
+        source_ids = {}
+        rows = []
+        row_ids = {}
+        common_topics = []
 
-    args = parser.parse_args()
+        for group in result["common_topics"]:
+            refs = []
+            for headline in group["headlines"]:
+                source_id = source_ids.get(headline["source"])
+                if source_id is None:
+                    source_id = source_ids[headline["source"]] = len(sources)
+                    sources.append(headline["source"])
 
-    try:
-        scraper = BrutalistReportScraper()
-        scraper.run(topic=args.topic, last_week=args.last_week)
-    except KeyboardInterrupt:
-        print(
-            json.dumps({"status": "error", "message": "Operation cancelled by user."})
+                source_link = headline.get("source_link")
+                key = (
+                    source_id,
+                    headline["title"],
+                    headline["url"],
+                    headline.get("time"),
+                    source_link and (source_link["text"], source_link["url"]),
+                )
+                row_id = row_ids.get(key)
+                if row_id is None:
+                    row_id = row_ids[key] = len(rows)
+                    rows.append(
+                        [
+                            source_id,
+                            headline["title"],
+                            headline["url"],
+                            headline.get("time"),
+                            source_link,
+                        ]
+                    )
+                refs.append(row_id)
+            common_topics.append(dict(group, headlines=refs))
+
+        return dict(
+            result,
+            format="compact",
+            sources=sources,
+            headline_fields=["source", "title", "url", "time", "source_link"],
+            headlines=rows,
+            common_topics=common_topics,
         )
-        sys.exit(1)
+
+    def emit_result(self, result, per_topic=False):
+        """
+        Outputs a final result in the configured format. With an output
+        path the result is written there and only a small pointer event is
+        printed; `per_topic` adds the topic to the file name (batch mode).
+        """
+        if self.output_format == "compact":
+            result = self.compact_result(result)
+        payload = encode_json(result)
+
+        if not self.output_path:
+            with self._output_lock:
+                # Write bytes directly so non-ASCII output never depends on
+                # the console encoding
+                buffer = getattr(sys.stdout, "buffer", None)
+                if buffer is None:
+                    print(payload.decode("utf-8"), flush=True)
+                else:
+                    sys.stdout.flush()
+                    buffer.write(payload + b"\n")
+                    buffer.flush()
+            return
+
+        path = self.output_path
+        if per_topic:
+            root, ext = os.path.splitext(path)
+            path = f"{root}_{result['topic']}{ext or '.json'}"
+        path = os.path.abspath(path)
+        with open(path, "wb") as f:
+            f.write(payload)
+
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "result_file",
+                    "path": path,
+                    "format": self.output_format,
+                    "topic": result["topic"],
+                    "total_groups": result["total_groups"],
+                    "bytes": len(payload),
+                }
+            )
+        )
+
+    def write_metrics(self):
+        """Writes the metrics registry to `metrics_path` if one is set"""
+        if not self.metrics_path:
+            return
+        try:
+            self.metrics.write(self.metrics_path)
+        except OSError as e:
+            self.update_progress(
+                json.dumps(
+                    {"status": "progress", "message": f"Could not write metrics: {e}"}
+                )
+            )
+
+    def fetch_page_if_changed(self, url, state):
+        """
+        Re-fetches a page with a conditional GET. `state` holds the ETag,
+        Last-Modified and content hash of the previous fetch and is updated
+        in place. Returns parsed news data, or None if the page is unchanged.
+        """
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        response = self._http_get(
+            url, "page", headers=headers, timeout=self._request_timeout("fetch", None)
+        )
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        state["etag"] = response.headers.get("ETag")
+        state["last_modified"] = response.headers.get("Last-Modified")
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if content_hash == state.get("hash"):
+            return None
+        state["hash"] = content_hash
+
+        return self.parse_page(response.text, url)
+
+    def _diff_sources(self, old_sources, new_sources):
+        """Per-source counts of headlines added and removed between two scrapes"""
+        changes = {}
+        for source in list(new_sources) + [s for s in old_sources if s not in new_sources]:
+            old = Counter((h["title"], h["url"]) for h in old_sources.get(source, []))
+            new = Counter((h["title"], h["url"]) for h in new_sources.get(source, []))
+            added = sum((new - old).values())
+            removed = sum((old - new).values())
+            if added or removed:
+                changes[source] = {"added": added, "removed": removed}
+        return changes
+
+    def watch(self, topic=None, interval=300):
+        """
+        Keeps today's analysis fresh by polling the page every `interval`
+        seconds. Unchanged pages (304 or same content hash) and pages whose
+        headline lists did not change are skipped. Otherwise only titles not
+        seen before are scored, groups with unchanged members reuse their
+        name and image, and an updated result is printed. Titles that left
+        the page stay indexed until they outnumber the live ones, when the
+        index is rebuilt from the current page, so a long watch costs in
+        proportion to the page rather than to every title ever seen.
+        """
+        url = self.create_url(topic)
+        state = {}
+        index = HeadlineIndex(self)
+        group_cache = {}
+        previous_sources = None
+        iteration = 0
+
+        while True:
+            self._start_run_clock()
+            try:
+                with self._timed_stage("fetch"):
+                    news_data = self.fetch_page_if_changed(url, state)
+            except requests.RequestException as e:
+                self.update_progress(
+                    json.dumps(
+                        {"status": "progress", "message": f"Error fetching {url}: {e}"}
+                    )
+                )
+                news_data = None
+
+            refreshed = False
+            if news_data and news_data.get("sources"):
+                changes = None
+                if previous_sources is not None:
+                    changes = self._diff_sources(previous_sources, news_data["sources"])
+
+                if previous_sources is None or changes:
+                    live_titles = {
+                        headline["title"]
+                        for headlines in news_data["sources"].values()
+                        for headline in headlines
+                    }
+                    stale = len(index) - len(live_titles & index.title_ids.keys())
+                    if stale > len(live_titles):
+                        index = HeadlineIndex(self)
+                    news_data["_index"] = index
+                    result = self._analyze(news_data, topic, False, group_cache)
+                    while len(group_cache) > self.WATCH_GROUP_CACHE_SIZE:
+                        del group_cache[next(iter(group_cache))]
+
+                    iteration += 1
+                    result["watch"] = {
+                        "iteration": iteration,
+                        "interval": interval,
+                        "changed_sources": changes or {},
+                    }
+                    self.emit_result(result)
+                    previous_sources = news_data["sources"]
+                    refreshed = True
+
+            self.write_metrics()
+
+            if previous_sources is not None and not refreshed:
+                self.update_progress(
+                    json.dumps(
+                        {
+                            "status": "progress",
+                            "message": f"No headline changes, checking again in {interval:g}s...",
+                        }
+                    )
+                )
+
+            self._cancel_event.wait(interval)
+            self._check_cancelled()
+
+    def run(self, topic=None, last_week=False, dates=None, watch=None):
+        """
+        Main entry point to run the scraper. `dates` selects an explicit
+        window of `before` dates, which is analyzed like a last-week run.
+        `watch` keeps re-checking today's page every `watch` seconds.
+        """
+        if topic and topic not in self.AVAILABLE_TOPICS:
+            print(
+                json.dumps(
+                    {
+                        "status": "error",
+                        "message": f"Invalid topic. Available topics: {', '.join(self.AVAILABLE_TOPICS)}",
+                    }
+                )
+            )
+            return
+
+        if watch:
+            self.watch(topic, watch)
+            return
+
+        self._start_run_clock()
+        try:
+            # Scrape data
+            with self._timed_stage("fetch"):
+                if dates:
+                    last_week = True
+                    news_data = self.scrape_window(topic, dates)
+                elif last_week:
+                    news_data = self.scrape_last_week(topic)
+                else:
+                    news_data = self.scrape_today(topic)
+
+            if not news_data or not news_data.get("sources"):
+                print(
+                    json.dumps(
+                        {
+                            "status": "error",
+                            "message": "No data found. Please check your internet connection and try again.",
+                        }
+                    )
+                )
+                return
+
+            result = self._analyze(news_data, topic, last_week)
+            # Output final result as JSON
+            self.emit_result(result)
+
+        except Exception as e:
+            print(json.dumps({"status": "error", "message": str(e)}))
+
+    def run_archive(self, directory=None, topic=None, dates=None):
+        """Analyzes archived pages instead of scraping (see HeadlineArchive)"""
+        if topic and topic not in self.AVAILABLE_TOPICS:
+            print(
+                json.dumps(
+                    {
+                        "status": "error",
+                        "message": f"Invalid topic. Available topics: {', '.join(self.AVAILABLE_TOPICS)}",
+                    }
+                )
+            )
+            return
+
+        dates = dates or self._last_week_dates()
+        self._start_run_clock()
+        archive = HeadlineArchive(directory or os.path.join(self.cache_dir, "archive"))
+        try:
+            with self._timed_stage("clustering"):
+                common_topics = self.analyze_archive(archive, topic, dates)
+            if common_topics is None:
+                print(
+                    json.dumps(
+                        {
+                            "status": "error",
+                            "message": "No archived pages for this window. Run backfill and archive first.",
+                        }
+                    )
+                )
+                return
+
+            self.emit_result(
+                self._build_result(
+                    common_topics,
+                    f"{dates[-1]} to {dates[0]}",
+                    topic or "all",
+                    True,
+                    "disabled",
+                )
+            )
+        except Exception as e:
+            print(json.dumps({"status": "error", "message": str(e)}))
+        finally:
+            archive.close()
+
+    def run_import_archive(self, db_path=None, directory=None):
+        """
+        Appends backfilled pages that are not archived yet to the headline
+        archive, tokenizing each new title once.
+        """
+        queue = BackfillQueue(db_path or os.path.join(self.cache_dir, "backfill.sqlite"))
+        archive = HeadlineArchive(directory or os.path.join(self.cache_dir, "archive"))
+
+        imported = 0
+        batch = []
+        for topic, date, news_data in queue.pages():
+            self._check_cancelled()
+            if archive.has_page(topic, date):
+                continue
+            batch.append((topic, date, news_data))
+            if len(batch) == self.ARCHIVE_IMPORT_BATCH:
+                archive.append_pages(batch, self)
+                imported += len(batch)
+                batch = []
+                self.update_progress(
+                    json.dumps(
+                        {"status": "progress", "message": f"Archived {imported} pages..."}
+                    )
+                )
+        if batch:
+            archive.append_pages(batch, self)
+            imported += len(batch)
+
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "archive",
+                    "directory": os.path.abspath(archive.directory),
+                    "imported": imported,
+                    "pages": len(archive.pages),
+                    "headlines": archive.lengths["rows"] // HeadlineArchive.ROW_FIELDS,
+                    "titles": archive.lengths["titles"] // HeadlineArchive.TITLE_FIELDS,
+                }
+            )
+        )
+
+    def run_images(self, groups):
+        """Entry point for --images-for: looks up images for analysed groups"""
+        self._start_run_clock()
+        try:
+            with self._timed_stage("images"):
+                self.fetch_group_images(groups)
+        except Exception as e:
+            print(json.dumps({"status": "error", "message": str(e)}))
+
+    def serve_images(self, listener):
+        """
+        Entry point for serve-images: answers image requests read from stdin
+        by `listener` until stdin closes. The app keeps one such process, so
+        every card it expands shares this process's image caches and
+        concurrent requests for the same article share one fetch.
+        """
+        if listener is None:
+            print(
+                json.dumps(
+                    {
+                        "status": "error",
+                        "message": "serve-images reads its requests from a pipe on stdin",
+                    }
+                )
+            )
+            return
+        listener.join()
+
+    def process_backfill_jobs(self, queue, interval):
+        """
+        Fetches queued (topic, date) pages until the queue is drained,
+        starting each request no sooner than its rate-limit slot. Used by
+        backfill worker processes.
+        """
+        while True:
+            job = queue.claim(interval)
+            if job is None:
+                return
+            topic, date, start_at = job
+            delay = start_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            url = self.create_url(None if topic == "all" else topic, date)
+            try:
+                response = self._http_get(url, "page", timeout=30)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                queue.fail(topic, date, str(e), self.BACKFILL_MAX_ATTEMPTS)
+                continue
+
+            news_data = self.parse_page(response.text, url)
+            if news_data is None:
+                queue.fail(topic, date, "No news grid found", self.BACKFILL_MAX_ATTEMPTS)
+            else:
+                queue.complete(topic, date, news_data)
+
+    def run_backfill(self, topics, dates, db_path=None, rate=1.0):
+        """
+        Archives every (topic, date) page into a SQLite database using
+        `self.workers` processes and at most `rate` requests per second in
+        total. Progress is checkpointed per page, so an interrupted backfill
+        resumes where it stopped; failed pages are retried on the next run.
+        """
+        queue = BackfillQueue(db_path or os.path.join(self.cache_dir, "backfill.sqlite"))
+        queue.enqueue((topic or "all", date) for topic in topics for date in dates)
+        queue.requeue_unfinished()
+
+        processes = [
+            multiprocessing.Process(
+                target=_backfill_worker, args=(queue.path, 1.0 / rate), daemon=True
+            )
+            for _ in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            while any(process.is_alive() for process in processes):
+                self._cancel_event.wait(1.0)
+                self._check_cancelled()
+                counts = queue.counts()
+                self.update_progress(
+                    json.dumps(
+                        {
+                            "status": "progress",
+                            "message": f"Backfilling ({counts['failed']} failed)...",
+                            "processed": counts["done"] + counts["failed"],
+                            "total": sum(counts.values()),
+                        }
+                    )
+                )
+        finally:
+            # Claimed pages of stopped workers are requeued on the next run
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        counts = queue.counts()
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "backfill",
+                    "database": os.path.abspath(queue.path),
+                    "done": counts["done"],
+                    "failed": counts["failed"],
+                    "failures": queue.failures(),
+                }
+            )
+        )
+
+    def run_prefetch(self, topics, dates=None):
+        """
+        Warms the caches for the runs the app is likely to start next: today's
+        and the last-week pages of `topics`, their analyses with default
+        settings (so the interactive run hits the result cache) and images
+        for each analysis's largest groups. Runs at low priority.
+        """
+        if hasattr(os, "nice"):
+            os.nice(10)
+        # Fewer concurrent requests than an interactive batch
+        self.MAX_FETCH_WORKERS = self.PREFETCH_FETCH_WORKERS
+
+        self._start_run_clock()
+        dates = dates or self._last_week_dates()
+        try:
+            with self._timed_stage("fetch"):
+                pages = {
+                    False: self.scrape_batch(topics),
+                    True: self.scrape_batch(topics, dates=dates),
+                }
+        except Exception as e:
+            print(json.dumps({"status": "error", "message": str(e)}))
+            return
+
+        analyses = 0
+        images = 0
+        for last_week, batch_data in pages.items():
+            for topic in topics:
+                news_data = batch_data[topic]
+                if not news_data or not news_data.get("sources"):
+                    continue
+                try:
+                    result = self._analyze(news_data, topic, last_week)
+                    analyses += 1
+                    with self._timed_stage("images"):
+                        resolved = self.fetch_group_images(
+                            result["common_topics"][: self.PREFETCH_IMAGE_GROUPS]
+                        )
+                    images += sum(1 for image in resolved.values() if "url" in image)
+                except Exception as e:
+                    print(
+                        json.dumps(
+                            {"status": "error", "topic": topic or "all", "message": str(e)}
+                        )
+                    )
+
+        self.update_progress(
+            json.dumps(
+                {
+                    "status": "prefetch",
+                    "topics": [topic or "all" for topic in topics],
+                    "analyses": analyses,
+                    "images": images,
+                    "timings": self._run_timings(),
+                }
+            )
+        )
+
+    def run_batch(self, topics, last_week=False, dates=None):
+        """
+        Runs several topics in one process. Pages are fetched concurrently
+        and token/image caches are shared, then one result is printed per
+        topic. None in `topics` stands for the front page (labelled "all").
+        """
+        invalid = [t for t in topics if t and t not in self.AVAILABLE_TOPICS]
+        if invalid:
+            print(
+                json.dumps(
+                    {
+                        "status": "error",
+                        "message": f"Invalid topic. Available topics: {', '.join(self.AVAILABLE_TOPICS)}",
+                    }
+                )
+            )
+            return
+
+        self._start_run_clock()
+        try:
+            if dates:
+                last_week = True
+            with self._timed_stage("fetch"):
+                batch_data = self.scrape_batch(topics, last_week, dates)
+        except Exception as e:
+            print(json.dumps({"status": "error", "message": str(e)}))
+            return
+
+        for topic in topics:
+            news_data = batch_data[topic]
+            try:
+                if not news_data or not news_data.get("sources"):
+                    print(
+                        json.dumps(
+                            {
+                                "status": "error",
+                                "topic": topic or "all",
+                                "message": "No data found. Please check your internet connection and try again.",
+                            }
+                        )
+                    )
+                    continue
+
+                self.emit_result(
+                    self._analyze(news_data, topic, last_week), per_topic=True
+                )
+
+            except Exception as e:
+                print(
+                    json.dumps(
+                        {"status": "error", "topic": topic or "all", "message": str(e)}
+                    )
+                )
+
+
+def encode_json(obj):
+    """Encodes `obj` as compact UTF-8 JSON, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def default_cache_dir():
+    """Per-user cache directory, overridable with BRUTALIST_CACHE_DIR"""
+    if os.environ.get("BRUTALIST_CACHE_DIR"):
+        return os.environ["BRUTALIST_CACHE_DIR"]
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "brutalist-report")
+
+
+def image_dimensions(data):
+    """
+    (width, height) from the header of a PNG, GIF, WebP or JPEG image, or
+    None when `data` ends before the size or is none of those formats
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) >= 24 and data[12:16] == b"IHDR":
+            return int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+        return None
+
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        if len(data) >= 10:
+            return int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little")
+        return None
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        chunk = data[12:16]
+        if chunk == b"VP8 " and len(data) >= 30:
+            # Lossy: 14-bit sizes after the frame tag and start code
+            return (
+                int.from_bytes(data[26:28], "little") & 0x3FFF,
+                int.from_bytes(data[28:30], "little") & 0x3FFF,
+            )
+        if chunk == b"VP8L" and len(data) >= 25:
+            # Lossless: 14-bit sizes minus one packed after the signature
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, (bits >> 14 & 0x3FFF) + 1
+        if chunk == b"VP8X" and len(data) >= 30:
+            # Extended: 24-bit canvas sizes minus one
+            return (
+                int.from_bytes(data[24:27], "little") + 1,
+                int.from_bytes(data[27:30], "little") + 1,
+            )
+        return None
+
+    if data[:2] == b"\xff\xd8":
+        # Walk the JPEG segments up to the first start-of-frame marker
+        position = 2
+        while position + 4 <= len(data):
+            if data[position] != 0xFF:
+                return None
+            marker = data[position + 1]
+            if marker == 0xFF:
+                position += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+                position += 2
+                continue
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                if position + 9 > len(data):
+                    return None
+                return (
+                    int.from_bytes(data[position + 7 : position + 9], "big"),
+                    int.from_bytes(data[position + 5 : position + 7], "big"),
+                )
+            position += 2 + int.from_bytes(data[position + 2 : position + 4], "big")
+        return None
+
+    return None
+
+
+class LRUMemo:
+    """
+    In-memory memo holding at most `max_entries` values, evicting the least
+    recently used. Hits and misses are counted for reporting.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the memoized value, or None on a miss"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key, value):
+        """Removes `key` if it still holds `value`"""
+        if self._entries.get(key) is value:
+            del self._entries[key]
+
+
+class DiskCache:
+    """
+    A directory of JSON entries named by key. Reads refresh an entry's
+    mtime and the least recently used entries are evicted once more than
+    `max_entries` are stored. Cache I/O errors are never fatal.
+    """
+
+    def __init__(self, directory, max_entries):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Returns the stored value, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        """Stores a value atomically, then evicts old entries"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+class DocumentFrequencyTable:
+    """
+    How many distinct headline titles each word and phrase appeared in,
+    kept as a JSON file across runs. Titles are remembered by fingerprint,
+    so a title seen again in a later run, refresh or prefetch is not
+    counted twice. Once more than `max_documents` titles have been counted
+    every count is halved and the older half of the fingerprints is
+    forgotten, so the table follows recent news, and only the `max_terms`
+    most frequent terms are kept. Each save merges into the stored table
+    under a lock file, so concurrent processes keep each other's counts.
+    Load and save errors are never fatal.
+    """
+
+    def __init__(self, path, max_terms, max_documents):
+        self.path = path
+        self.max_terms = max_terms
+        self.max_documents = max_documents
+        self._documents = None
+        self._counts = None
+        self._seen = None
+        # (fingerprint, terms) of titles counted since the last save
+        self._pending = []
+
+    def _read(self):
+        """The stored (documents, counts, fingerprints), empty if unreadable"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+            return (
+                int(stored["documents"]),
+                Counter(stored["terms"]),
+                array("Q", base64.b64decode(stored["seen"])),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0, Counter(), array("Q")
+
+    def _load(self):
+        if self._counts is not None:
+            return
+        self._documents, self._counts, seen = self._read()
+        self._seen = set(seen)
+
+    def record(self, documents):
+        """Counts each (title, distinct terms) pair as one document, once per title"""
+        self._load()
+        for title, terms in documents:
+            fingerprint = _title_fingerprint(title)
+            if fingerprint in self._seen:
+                continue
+            self._seen.add(fingerprint)
+            self._pending.append((fingerprint, terms))
+            self._documents += 1
+            self._counts.update(terms)
+
+    def common_terms(self, max_ratio, min_documents):
+        """Terms in more than `max_ratio` of documents, once enough are counted"""
+        self._load()
+        if self._documents < min_documents:
+            return frozenset()
+        limit = max_ratio * self._documents
+        return frozenset(term for term, count in self._counts.items() if count > limit)
+
+    def save(self):
+        """
+        Merges the titles counted since the last save into the stored table
+        and writes it atomically, dropping all but the most frequent terms
+        """
+        if not self._pending:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with _lock_file(f"{self.path}.lock"):
+                # Another process may have saved since this one loaded
+                documents, counts, seen = self._read()
+                stored = set(seen)
+                for fingerprint, terms in self._pending:
+                    if fingerprint not in stored:
+                        stored.add(fingerprint)
+                        seen.append(fingerprint)
+                        documents += 1
+                        counts.update(terms)
+                while documents > self.max_documents:
+                    documents //= 2
+                    counts = Counter(
+                        {term: count // 2 for term, count in counts.items() if count > 1}
+                    )
+                    # Forgotten titles are counted again if they come back
+                    seen = seen[len(seen) // 2 :]
+                if len(counts) > self.max_terms:
+                    counts = Counter(dict(counts.most_common(self.max_terms)))
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {
+                            "documents": documents,
+                            "terms": counts,
+                            "seen": base64.b64encode(seen.tobytes()).decode("ascii"),
+                        },
+                        f,
+                    )
+                os.replace(tmp_path, self.path)
+        except OSError:
+            return
+        self._documents, self._counts, self._seen = documents, counts, set(seen)
+        self._pending = []
+
+
+def _title_fingerprint(title):
+    """64-bit fingerprint of a title for the document-frequency table"""
+    return int.from_bytes(
+        hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+@contextmanager
+def _lock_file(path, timeout=10.0, stale=60.0):
+    """
+    Holds `path` as an exclusive lock file for the block. A lock older than
+    `stale` seconds is taken to be left by a crashed process and removed;
+    raises TimeoutError (an OSError) after waiting `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale:
+                    os.remove(path)
+            except OSError:
+                pass  # Released in the meantime
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class Metrics:
+    """
+    In-process counters and histograms, exported as OpenMetrics text.
+    Samples are keyed by metric name and labels; every family is declared
+    in FAMILIES so the export carries its type and help text.
+    """
+
+    enabled = True
+
+    FAMILIES = {
+        "brutalist_fetches": ("counter", "HTTP fetches by kind, host and outcome"),
+        "brutalist_downloaded_bytes": ("counter", "Response body bytes downloaded"),
+        "brutalist_fetch_duration_seconds": ("histogram", "HTTP fetch latency"),
+        "brutalist_cache_requests": ("counter", "Cache lookups by cache and result"),
+        "brutalist_similarity_pairs": (
+            "counter",
+            "Title pairs scored, skipped by the score upper bound, or pruned by the inverted index",
+        ),
+        "brutalist_common_terms": (
+            "counter",
+            "Words and phrases left out of candidate generation for being too common",
+        ),
+        "brutalist_similarity_edges": ("counter", "Title pairs scoring at or above the threshold"),
+        "brutalist_image_probes": (
+            "counter",
+            "Candidate images by probe outcome: ok, too_small, unavailable or unknown",
+        ),
+        "brutalist_groups": ("counter", "Candidate groups formed or rejected, by rule"),
+        "brutalist_stage_seconds": ("counter", "Time spent in each run stage"),
+    }
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        """Adds `value` to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Records one histogram observation"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    "buckets": [0] * (len(self.LATENCY_BUCKETS) + 1),
+                    "sum": 0.0,
+                }
+            histogram["buckets"][bisect_left(self.LATENCY_BUCKETS, value)] += 1
+            histogram["sum"] += value
+
+    def to_openmetrics(self):
+        """Renders every sample in the OpenMetrics text format"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: {"buckets": list(h["buckets"]), "sum": h["sum"]}
+                for key, h in self._histograms.items()
+            }
+
+        lines = []
+        for name, (metric_type, help_text) in self.FAMILIES.items():
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"# HELP {name} {help_text}.")
+            if metric_type == "counter":
+                for (sample_name, labels), value in sorted(counters.items()):
+                    if sample_name == name:
+                        lines.append(
+                            f"{name}_total{_format_labels(labels)} {_format_value(value)}"
+                        )
+                continue
+
+            for (sample_name, labels), histogram in sorted(histograms.items()):
+                if sample_name != name:
+                    continue
+                cumulative = 0
+                bounds = [_format_value(b) for b in self.LATENCY_BUCKETS] + ["+Inf"]
+                for bound, count in zip(bounds, histogram["buckets"]):
+                    cumulative += count
+                    bucket_labels = _format_labels(labels + (("le", bound),))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}"
+                )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes the OpenMetrics export to `path` atomically"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_openmetrics())
+        os.replace(tmp_path, path)
+
+
+class NullMetrics(Metrics):
+    """Registry used while metrics are disabled; recording is a no-op"""
+
+    enabled = False
+
+    def inc(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+
+def _format_labels(labels):
+    """Renders a sorted label tuple as an OpenMetrics label set"""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    """Renders a sample value; floats are rounded to microsecond precision"""
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class BackfillQueue:
+    """
+    Durable (topic, date) work queue and page archive in SQLite, shared by
+    backfill worker processes. Jobs move from pending to running to done
+    (or failed), and a page is stored in the same transaction that marks
+    its job done. A single row holds the next free request slot so every
+    process respects one shared rate limit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            # WAL lets the progress monitor read while workers write
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    topic TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    PRIMARY KEY (topic, date)
+                );
+                CREATE TABLE IF NOT EXISTS pages (
+                    topic TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    news_data TEXT NOT NULL,
+                    PRIMARY KEY (topic, date)
+                );
+                CREATE TABLE IF NOT EXISTS rate_limit (next_slot REAL NOT NULL);
+                """
+            )
+        finally:
+            db.close()
+
+    @contextmanager
+    def _connect(self):
+        """A connection whose block runs as one write transaction"""
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def enqueue(self, jobs):
+        """Adds (topic, date) jobs; ones already queued or done are kept as-is"""
+        with self._connect() as db:
+            db.executemany("INSERT OR IGNORE INTO jobs (topic, date) VALUES (?, ?)", jobs)
+
+    def requeue_unfinished(self):
+        """Returns jobs of interrupted workers and failed jobs to the queue"""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0"
+                " WHERE state IN ('running', 'failed')"
+            )
+
+    def claim(self, interval):
+        """
+        Claims the newest pending job and reserves the next request slot.
+        Returns (topic, date, start_at), or None once nothing is pending.
+        """
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT topic, date FROM jobs WHERE state = 'pending'"
+                " ORDER BY date DESC, topic LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET state = 'running' WHERE topic = ? AND date = ?", row
+            )
+
+            slot = db.execute("SELECT next_slot FROM rate_limit").fetchone()
+            start_at = max(time.time(), slot[0] if slot else 0.0)
+            db.execute("DELETE FROM rate_limit")
+            db.execute("INSERT INTO rate_limit VALUES (?)", (start_at + interval,))
+        return row[0], row[1], start_at
+
+    def complete(self, topic, date, news_data):
+        """Stores a fetched page and marks its job done"""
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                (topic, date, time.time(), json.dumps(news_data)),
+            )
+            db.execute(
+                "UPDATE jobs SET state = 'done', error = NULL WHERE topic = ? AND date = ?",
+                (topic, date),
+            )
+
+    def fail(self, topic, date, error, max_attempts):
+        """Records a failed attempt; the job is retried until max_attempts"""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET attempts = attempts + 1, error = ?,"
+                " state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END"
+                " WHERE topic = ? AND date = ?",
+                (error, max_attempts, topic, date),
+            )
+
+    def counts(self):
+        """Number of jobs in each state"""
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        with self._connect() as db:
+            for state, count in db.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ):
+                counts[state] = count
+        return counts
+
+    def pages(self):
+        """Yields archived (topic, date, news_data), by topic and newest first"""
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            for topic, date, news_data in db.execute(
+                "SELECT topic, date, news_data FROM pages ORDER BY topic, date DESC"
+            ):
+                yield topic, date, json.loads(news_data)
+        finally:
+            db.close()
+
+    def failures(self):
+        """Failed jobs as {"topic", "date", "error"} dicts"""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT topic, date, error FROM jobs WHERE state = 'failed'"
+                " ORDER BY date DESC, topic"
+            ).fetchall()
+        return [{"topic": topic, "date": date, "error": error} for topic, date, error in rows]
+
+
+def _backfill_worker(db_path, interval):
+    # Ctrl+C reaches the whole process group; the parent stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    BrutalistReportScraper().process_backfill_jobs(BackfillQueue(db_path), interval)
+
+
+class _Grouping:
+    """Per-call state shared by the group assembly steps"""
+
+    def __init__(self, all_headlines, headline_title_ids, positions_by_title, similar_titles):
+        self.all_headlines = all_headlines
+        self.headline_title_ids = headline_title_ids
+        self.positions_by_title = positions_by_title
+        self.similar_titles = similar_titles
+        # Titles already placed in an accepted group
+        self.processed_titles = set()
+
+
+class HeadlineIndex:
+    """
+    Distinct headline titles with their cached features and an inverted
+    index from important words to title ids. Filled incrementally as pages
+    arrive and consumed by the similarity graph builder.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.title_ids = {}
+        self.titles = []
+        self.features = []
+        self.postings = {}
+        # Similarity graph over title ids, scored up to `scored` ids
+        self.similar = []
+        self.scored = 0
+        self.graph_threshold = None
+        # Terms too common to generate candidates, fixed at the first scoring,
+        # and titles counted into the document-frequency table so far
+        self.common_terms = None
+        self.recorded = 0
+
+    def __len__(self):
+        return len(self.features)
+
+    def term_name(self, term):
+        """The word or phrase a postings key stands for"""
+        return term
+
+    def title_text(self, title_id):
+        """The title string of a title id"""
+        return self.titles[title_id]
+
+    def add(self, title):
+        """Returns the title's id, tokenizing and indexing it if new"""
+        title_id = self.title_ids.get(title)
+        if title_id is None:
+            title_id = self._append(title, self.scraper._get_headline_features(title))
+        return title_id
+
+    def add_many(self, titles):
+        """add() for a list of titles, tokenizing the new ones in one batch"""
+        title_ids = self.title_ids
+        new_titles = [title for title in dict.fromkeys(titles) if title not in title_ids]
+        for title, features in zip(new_titles, self.scraper.headline_features(new_titles)):
+            self._append(title, features)
+        return [title_ids[title] for title in titles]
+
+    def _append(self, title, features):
+        title_id = len(self.features)
+        self.title_ids[title] = title_id
+        self.titles.append(title)
+        self.features.append(features)
+        for word in features["word_set"]:
+            self.postings.setdefault(word, []).append(title_id)
+        return title_id
+
+
+class ArchiveIndex(HeadlineIndex):
+    """
+    A HeadlineIndex filled from a HeadlineArchive. Titles come with their
+    archived features instead of being tokenized; words and phrases are
+    string ids rather than strings.
+    """
+
+    def __init__(self, scraper, archive):
+        super().__init__(scraper)
+        self.archive = archive
+
+    def term_name(self, term):
+        return self.archive.string(term)
+
+    def title_text(self, title_id):
+        return self.archive.title(self.titles[title_id])
+
+    def add_archived(self, archive_title_id):
+        """Returns the index id of an archived title, adding it if new"""
+        title_id = self.title_ids.get(archive_title_id)
+        if title_id is None:
+            title_id = len(self.features)
+            features = self.archive.title_features(archive_title_id)
+            self.title_ids[archive_title_id] = title_id
+            self.titles.append(archive_title_id)
+            self.features.append(features)
+            for word in features["word_set"]:
+                self.postings.setdefault(word, []).append(title_id)
+        return title_id
+
+
+class _ArchivedHeadlines:
+    """Archive rows as a lazy sequence of (source, headline) pairs"""
+
+    def __init__(self, archive, rows):
+        self.archive = archive
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        return self.archive.headline(self.rows[position])
+
+
+class HeadlineArchive:
+    """
+    Append-only columnar archive of scraped pages, read through mmap so an
+    analysis works on zero-copy views instead of JSON and re-tokenizing.
+    A directory of native-endian column files:
+
+    - strings.bin, strings.off: UTF-8 string table and its uint64 offsets
+    - titles.bin: uint32 (string id, token start, important word count,
+      phrase count, conflict term mask) per distinct title
+    - tokens.bin: uint32 string ids of each title's important words (with
+      repeats, as scored) followed by its phrases
+    - rows.bin: int32 (topic, date, source, title, url, time, source link)
+      per headline, with YYYYMMDD dates and -1 for None
+
+    manifest.json holds the committed length of each file and the row range
+    of every page. Bytes past a committed length come from an interrupted
+    append and are overwritten by the next one.
+    """
+
+    VERSION = 1
+
+    # File name and array typecode of each column
+    COLUMN_FILES = {
+        "strings": ("strings.bin", "B"),
+        "offsets": ("strings.off", "Q"),
+        "titles": ("titles.bin", "I"),
+        "tokens": ("tokens.bin", "I"),
+        "rows": ("rows.bin", "i"),
+    }
+    ROW_FIELDS = 7
+    ROW_COLUMNS = ["topic", "date", "source", "title", "url", "time", "source_link"]
+    TITLE_FIELDS = 5
+    CONFLICT_TERMS = sorted(
+        {term for pair in BrutalistReportScraper.CONFLICTING_PAIRS for term in pair}
+    )
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._maps = {}
+        self._views = {}
+        # String and title id lookups for appends, built on the first one
+        self._string_ids = None
+        self._title_ids = None
+        try:
+            with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {"version": self.VERSION, "lengths": {}, "pages": []}
+        if manifest["version"] != self.VERSION:
+            raise ValueError(f"Unsupported archive version {manifest['version']}")
+        self.lengths = {name: manifest["lengths"].get(name, 0) for name in self.COLUMN_FILES}
+        self.pages = {(topic, date): (start, end) for topic, date, start, end in manifest["pages"]}
+
+    def has_page(self, topic, date):
+        return (topic, date) in self.pages
+
+    def _view(self, name):
+        """Read-only view of a column's committed items"""
+        view = self._views.get(name)
+        if view is None:
+            file_name, typecode = self.COLUMN_FILES[name]
+            length = self.lengths[name]
+            if length == 0:
+                view = memoryview(array(typecode))
+            else:
+                with open(os.path.join(self.directory, file_name), "rb") as f:
+                    self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                itemsize = array(typecode).itemsize
+                view = memoryview(self._maps[name])[: length * itemsize].cast(typecode)
+            self._views[name] = view
+        return view
+
+    def close(self):
+        """Releases every view and mapping"""
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps.values():
+            mapped.close()
+        self._views = {}
+        self._maps = {}
+
+    def column(self, field):
+        """Strided view of one row field, indexed by row number"""
+        return self._view("rows")[self.ROW_COLUMNS.index(field) :: self.ROW_FIELDS]
+
+    def string(self, string_id):
+        if string_id < 0:
+            return None
+        offsets = self._view("offsets")
+        return bytes(self._view("strings")[offsets[string_id] : offsets[string_id + 1]]).decode(
+            "utf-8"
+        )
+
+    def select_rows(self, topic, dates):
+        """Row numbers of `topic`'s archived pages for `dates`, in date order"""
+        rows = []
+        for date in dates:
+            start, end = self.pages.get((topic, date), (0, 0))
+            rows.extend(range(start, end))
+        return rows
+
+    def title_features(self, title_id):
+        """Scoring features of an archived title, as _score_features expects"""
+        offset = title_id * self.TITLE_FIELDS
+        _, start, important, phrases, conflict_mask = self._view("titles")[
+            offset : offset + self.TITLE_FIELDS
+        ]
+        tokens = self._view("tokens")
+        return {
+            "word_set": frozenset(tokens[start : start + important]),
+            "phrase_set": frozenset(tokens[start + important : start + important + phrases]),
+            # Only its length is scored
+            "important": range(important),
+            "conflict_terms": frozenset(
+                term
+                for bit, term in enumerate(self.CONFLICT_TERMS)
+                if conflict_mask >> bit & 1
+            ),
+        }
+
+    def title(self, title_id):
+        """The title string of an archived title"""
+        return self.string(self._view("titles")[title_id * self.TITLE_FIELDS])
+
+    def headline(self, row):
+        """Rebuilds the (source, headline) pair of a row"""
+        offset = row * self.ROW_FIELDS
+        _, _, source, title_id, url, time_id, link = self._view("rows")[
+            offset : offset + self.ROW_FIELDS
+        ]
+        source_link = self.string(link)
+        return self.string(source), {
+            "title": self.title(title_id),
+            "url": self.string(url),
+            "time": self.string(time_id),
+            "source_link": source_link and json.loads(source_link),
+        }
+
+    def append_pages(self, pages, scraper):
+        """
+        Appends (topic, date, news_data) pages and commits them. New titles
+        are tokenized with `scraper` and stored with their features.
+        """
+        try:
+            self._append_pages(pages, scraper)
+        except BaseException:
+            # The id lookups may name uncommitted ids; rebuild them next time
+            self._string_ids = None
+            self._title_ids = None
+            raise
+
+    def _append_pages(self, pages, scraper):
+        if self._string_ids is None:
+            self._string_ids = {
+                self.string(string_id): string_id
+                for string_id in range(max(self.lengths["offsets"] - 1, 0))
+            }
+            self._title_ids = {
+                string_id: title_id
+                for title_id, string_id in enumerate(self._view("titles")[:: self.TITLE_FIELDS])
+            }
+        string_ids = self._string_ids
+        title_ids = self._title_ids
+        offsets = self._view("offsets")
+        new = {name: array(typecode) for name, (_, typecode) in self.COLUMN_FILES.items()}
+        string_end = offsets[-1] if len(offsets) else 0
+        if not len(offsets):
+            new["offsets"].append(0)
+        token_count = self.lengths["tokens"]
+        row_count = self.lengths["rows"] // self.ROW_FIELDS
+
+        def intern(value):
+            nonlocal string_end
+            if value is None:
+                return -1
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(string_ids)
+                encoded = value.encode("utf-8")
+                new["strings"].frombytes(encoded)
+                string_end += len(encoded)
+                new["offsets"].append(string_end)
+            return string_id
+
+        page_ranges = []
+        for topic, date, news_data in pages:
+            start = row_count
+            for source, headlines in news_data["sources"].items():
+                for headline in headlines:
+                    title = intern(headline["title"])
+                    title_id = title_ids.get(title)
+                    if title_id is None:
+                        title_id = title_ids[title] = len(title_ids)
+                        features = scraper._get_headline_features(headline["title"])
+                        important = [intern(word) for word in features["important"]]
+                        phrases = [intern(phrase) for phrase in features["phrases"]]
+                        conflict_mask = sum(
+                            1 << bit
+                            for bit, term in enumerate(self.CONFLICT_TERMS)
+                            if term in features["conflict_terms"]
+                        )
+                        new["titles"].extend(
+                            (title, token_count, len(important), len(phrases), conflict_mask)
+                        )
+                        new["tokens"].extend(important + phrases)
+                        token_count += len(important) + len(phrases)
+
+                    source_link = headline.get("source_link")
+                    new["rows"].extend(
+                        (
+                            intern(topic),
+                            int(date.replace("-", "")),
+                            intern(source),
+                            title_id,
+                            intern(headline["url"]),
+                            intern(headline.get("time")),
+                            intern(source_link and json.dumps(source_link)),
+                        )
+                    )
+                    row_count += 1
+            page_ranges.append((topic, date, start, row_count))
+
+        # Files may not be resized while mapped
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        for name, (file_name, typecode) in self.COLUMN_FILES.items():
+            path = os.path.join(self.directory, file_name)
+            committed = self.lengths[name] * array(typecode).itemsize
+            with open(path, "ab") as f:
+                pass
+            with open(path, "r+b") as f:
+                f.truncate(committed)
+                f.seek(committed)
+                new[name].tofile(f)
+            self.lengths[name] += len(new[name])
+
+        for topic, date, start, end in page_ranges:
+            self.pages[(topic, date)] = (start, end)
+        manifest_path = os.path.join(self.directory, "manifest.json")
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "lengths": self.lengths,
+                    "pages": [[*page, *span] for page, span in self.pages.items()],
+                },
+                f,
+            )
+        os.replace(tmp_path, manifest_path)
+
+
+def _score_row_block(features, postings, threshold, start, end, new_from=0):
+    """
+    Returns (pairs, histogram, bounded) for rows start <= i < end: the
+    (i, j, score bin) of pairs whose similarity score reaches `threshold`,
+    in ascending order, the histogram of every scored pair by score bin,
+    and the number of candidates skipped without scoring. j ranges over ids
+    after i and, when rows from `new_from` on were added to an already
+    scored index, over the previously scored ids before `new_from` as well.
+
+    When all of row i's words are indexed, a candidate is skipped if an
+    upper bound on its score falls below `threshold`: counting the postings
+    it appears in gives the size of its shared word set, and every shared
+    phrase is made of shared words, so too few cannot reach the threshold.
+    """
+    score = BrutalistReportScraper._score_features
+    score_bins = Counter()
+    top_bin = BrutalistReportScraper.SCORE_HISTOGRAM_BINS - 1
+    least_shared = {}
+    pairs = []
+    bounded = 0
+    for i in range(start, end):
+        features1 = features[i]
+        words1 = features1["word_set"]
+        phrases1 = len(features1["phrase_set"])
+        least = least_shared.get(phrases1)
+        if least is None:
+            least = least_shared[phrases1] = _least_shared_words(phrases1, threshold)
+
+        if len(features1["words"]) == len(words1):
+            # Every word is indexed, so counting postings counts shared words
+            shared_words = Counter()
+            for word in words1:
+                posting = postings[word]
+                shared_words.update(posting[bisect_right(posting, i) :])
+                if new_from:
+                    shared_words.update(posting[: bisect_left(posting, new_from)])
+            found = len(shared_words)
+            candidates = [j for j, shared in shared_words.items() if shared >= least]
+        else:
+            # Common words are not indexed, so the counts would not bound the
+            # score; every candidate is scored
+            candidates = set()
+            for terms in (features1["words"], features1["phrases"]):
+                for term in terms:
+                    posting = postings[term]
+                    candidates.update(posting[bisect_right(posting, i) :])
+                    if new_from:
+                        candidates.update(posting[: bisect_left(posting, new_from)])
+            candidates = list(candidates)
+            found = len(candidates)
+
+        bounded += found - len(candidates)
+        candidates.sort()
+        values = [score(features1, features[j]) for j in candidates]
+        score_bins.update(map(int, values))
+        pairs.extend(
+            (i, j, min(int(value), top_bin))
+            for j, value in zip(candidates, values)
+            if value >= threshold
+        )
+
+    histogram = [0] * (top_bin + 1)
+    for score_bin, count in score_bins.items():
+        histogram[min(score_bin, top_bin)] += count
+    return pairs, histogram, bounded
+
+
+def _score_upper_bound(shared_words, max_shared_phrases):
+    """
+    Highest score _score_features can give a pair sharing `shared_words`
+    words and at most `max_shared_phrases` phrases, ignoring penalties
+    """
+    shared_phrases = min(max_shared_phrases, shared_words * shared_words)
+    if shared_phrases:
+        return shared_words * 2 + shared_phrases * 6
+    return shared_words * 1.5 if shared_words >= 3 else 0
+
+
+def _least_shared_words(phrases, threshold):
+    """Fewest shared words that let a title with `phrases` phrases reach `threshold`"""
+    shared = 1
+    while _score_upper_bound(shared, phrases) < threshold:
+        shared += 1
+    return shared
+
+
+# Scoring state shipped once to each worker process by its initializer
+_worker_state = {}
+
+
+def _init_scoring_worker(features, postings, threshold):
+    # Ctrl+C reaches the whole process group; the parent handles cancellation
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_state["features"] = features
+    _worker_state["postings"] = postings
+    _worker_state["threshold"] = threshold
+
+
+def _score_worker_block(start, end, new_from=0):
+    return _score_row_block(
+        _worker_state["features"],
+        _worker_state["postings"],
+        _worker_state["threshold"],
+        start,
+        end,
+        new_from,
+    )
+
+
+def install_cancel_handlers(scraper):
+    """
+    Routes SIGINT/SIGTERM and cancel messages on stdin to scraper.cancel().
+    Signal handlers raise AnalysisCancelled in the main thread, which also
+    aborts a request it is blocked in. Returns the stdin listener thread,
+    or None when stdin is a terminal.
+    """
+
+    def handle_signal(signum, frame):
+        scraper.cancel(signal.Signals(signum).name)
+        raise AnalysisCancelled(scraper.cancel_reason)
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    # The app talks to us through a pipe; an interactive terminal has Ctrl+C
+    if sys.stdin is None or sys.stdin.isatty():
+        return None
+    listener = threading.Thread(
+        target=_listen_for_commands, args=(scraper,), daemon=True
+    )
+    listener.start()
+    return listener
+
+
+def _listen_for_commands(scraper):
+    """
+    Reads commands from stdin: "cancel" cancels the run and "metrics"
+    prints the metrics registry as a {"status": "metrics"} event. Either
+    may also be sent as {"command": ...}. {"command": "images", "groups":
+    [...]} looks up group images in the background (see fetch_group_images).
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = line
+        groups = None
+        if isinstance(message, dict):
+            groups = message.get("groups")
+            message = message.get("command")
+
+        if message == "images":
+            threading.Thread(
+                target=_serve_images, args=(scraper, groups), daemon=True
+            ).start()
+        elif message == "metrics":
+            scraper.update_progress(
+                json.dumps(
+                    {
+                        "status": "metrics",
+                        "enabled": scraper.metrics.enabled,
+                        "text": scraper.metrics.to_openmetrics(),
+                    }
+                )
+            )
+        elif message == "cancel":
+            scraper.cancel("stdin")
+            # Wake the main thread, interrupting a blocking call where possible
+            if hasattr(signal, "pthread_kill"):
+                signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+            else:
+                _thread.interrupt_main()
+            return
+
+
+def _serve_images(scraper, groups):
+    """Runs a stdin image request, reporting a malformed one as an error event"""
+    try:
+        groups = validate_groups(groups)
+    except ValueError as e:
+        scraper.update_progress(json.dumps({"status": "error", "message": str(e)}))
+        return
+    try:
+        scraper.fetch_group_images(groups)
+    except AnalysisCancelled:
+        pass  # The main thread reports the cancellation
+
+
+def validate_groups(groups):
+    """
+    Checks an image request: a list of groups, or a saved result whose
+    common_topics are used. Raises ValueError if it is malformed.
+    """
+    if isinstance(groups, dict):
+        groups = groups.get("common_topics")
+    if not isinstance(groups, list):
+        raise ValueError("expected a list of groups")
+    for group in groups:
+        if (
+            not isinstance(group, dict)
+            or "id" not in group
+            or not isinstance(group.get("headlines"), list)
+            or not all(
+                isinstance(h, dict) and "source" in h and "url" in h
+                for h in group["headlines"]
+            )
+        ):
+            raise ValueError("each group needs an id and headlines with source and url")
+    return groups
+
+
+def parse_groups(value):
+    """Parses --images-for: inline JSON, or the path of a JSON file"""
+    try:
+        if value.lstrip().startswith(("[", "{")):
+            groups = json.loads(value)
+        else:
+            with open(value, encoding="utf-8") as f:
+                groups = json.load(f)
+        return validate_groups(groups)
+    except (OSError, ValueError) as e:
+        raise argparse.ArgumentTypeError(f"invalid groups: {e}")
+
+
+def parse_topics(value):
+    """
+    Parses --topics: "all" for the front page plus every topic, or a comma
+    separated list where "front" selects the front page.
+    """
+    if value.strip() == "all":
+        return [None] + BrutalistReportScraper.AVAILABLE_TOPICS
+
+    topics = []
+    for name in value.split(","):
+        name = name.strip()
+        if name == "front":
+            topic = None
+        elif name in BrutalistReportScraper.AVAILABLE_TOPICS:
+            topic = name
+        else:
+            raise argparse.ArgumentTypeError(
+                f"invalid topic '{name}' (choose from front, {', '.join(BrutalistReportScraper.AVAILABLE_TOPICS)} or all)"
+            )
+        if topic not in topics:
+            topics.append(topic)
+    return topics
+
+
+def parse_date(value):
+    """Parses a YYYY-MM-DD command-line date"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+
+def main():
+    """Command-line interface for the Brutalist Report Scraper"""
+    parser = argparse.ArgumentParser(description="Enhanced Brutalist Report Scraper")
+    topic_group = parser.add_mutually_exclusive_group()
+    topic_group.add_argument(
+        "--topic",
+        choices=BrutalistReportScraper.AVAILABLE_TOPICS,
+        help="Filter by topic (tech, news, business, science, gaming, culture, politics, sports)",
+    )
+    topic_group.add_argument(
+        "--topics",
+        type=parse_topics,
+        help="Batch mode: 'all' or a comma separated list of topics ('front' for the front page), one result per topic",
+    )
+    window_group = parser.add_mutually_exclusive_group()
+    window_group.add_argument(
+        "--last-week",
+        action="store_true",
+        help="Scrape last week's headlines instead of today's",
+    )
+    window_group.add_argument(
+        "--days",
+        type=int,
+        help="Scrape a window of N days ending at --until (default: two days ago)",
+    )
+    window_group.add_argument(
+        "--since",
+        type=parse_date,
+        help="Scrape every day from this date (YYYY-MM-DD) to --until",
+    )
+    parser.add_argument(
+        "--until",
+        type=parse_date,
+        help="Newest day of a --days/--since window (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="INTERVAL",
+        help="Keep re-checking today's page every INTERVAL seconds and print updated results",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Overall time budget; once it runs out remaining images are skipped and partial results returned",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Output results with headlines stored once in a table and referenced by index",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write the result to FILE and print only a small result_file event",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch pages and recompute the analysis instead of reusing cached ones",
+    )
+    parser.add_argument(
+        "--images",
+        action="store_true",
+        help="Extract an image for every group during the analysis",
+    )
+    parser.add_argument(
+        "--probe-images",
+        action="store_true",
+        help="Read the first few KB of each candidate image and skip tracking pixels and thumbnails",
+    )
+    parser.add_argument(
+        "--images-for",
+        type=parse_groups,
+        metavar="GROUPS",
+        help="Only look up images for GROUPS (JSON list of groups with id and headlines, a saved result, or a file with either)",
+    )
+    parser.add_argument(
+        "--from-archive",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="Analyze archived pages of the window instead of scraping (default DIR: archive in the cache directory)",
+    )
+    parser.add_argument(
+        "--max-df",
+        type=float,
+        metavar="RATIO",
+        help="Ignore words and phrases found in more than RATIO of past headlines when pairing candidates, e.g. 0.1 (default: off)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        metavar="K",
+        help="Only find, name and fetch images for the K largest groups",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Collect fetch, cache and clustering metrics and write them to FILE as OpenMetrics text",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes used to score headline pairs (default: 1)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Archive past pages into a resumable SQLite database",
+        description="Fetches one page per topic and day into a SQLite archive. Interrupted backfills resume where they stopped.",
+    )
+    # Options shared with the top level are suppressed when not given, so
+    # ones placed before the subcommand still apply; defaults are set in main
+    backfill_parser.add_argument(
+        "--topics",
+        type=parse_topics,
+        default=argparse.SUPPRESS,
+        help="'all' (default) or a comma separated list of topics ('front' for the front page)",
+    )
+    backfill_window = backfill_parser.add_mutually_exclusive_group()
+    backfill_window.add_argument(
+        "--days",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Days to archive, ending at --until (default: 365)",
+    )
+    backfill_window.add_argument(
+        "--since",
+        type=parse_date,
+        default=argparse.SUPPRESS,
+        help="Archive every day from this date (YYYY-MM-DD)",
+    )
+    backfill_parser.add_argument(
+        "--until",
+        type=parse_date,
+        default=argparse.SUPPRESS,
+        help="Newest day to archive (YYYY-MM-DD, default: two days ago)",
+    )
+    backfill_parser.add_argument(
+        "--workers",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Worker processes fetching pages (default: 4)",
+    )
+    backfill_parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Maximum requests per second across all workers (default: 1)",
+    )
+    backfill_parser.add_argument(
+        "--db",
+        metavar="FILE",
+        help="SQLite archive to fill (default: backfill.sqlite in the cache directory)",
+    )
+
+    prefetch_parser = subparsers.add_parser(
+        "prefetch",
+        help="Warm the page, result and image caches in the background",
+        description="Fetches today's and last week's pages, analyzes them and resolves images for the largest groups at low priority, so the next interactive run is served from cache.",
+    )
+    prefetch_parser.add_argument(
+        "--topics",
+        type=parse_topics,
+        default=argparse.SUPPRESS,
+        help="'all' (default) or a comma separated list of topics ('front' for the front page)",
+    )
+
+    subparsers.add_parser(
+        "serve-images",
+        help="Look up group images for requests read from stdin until it closes",
+        description='Stays running and answers {"command": "images", "groups": [...]} lines on stdin with image events, so concurrent requests for the same article share one fetch.',
+    )
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="Import backfilled pages into the memory-mapped headline archive",
+        description="Appends pages from a backfill database that are not archived yet to the headline archive used by --from-archive.",
+    )
+    archive_parser.add_argument(
+        "--db",
+        metavar="FILE",
+        help="Backfill database to import (default: backfill.sqlite in the cache directory)",
+    )
+    archive_parser.add_argument(
+        "--dir",
+        metavar="DIR",
+        help="Archive directory (default: archive in the cache directory)",
+    )
+
+    args = parser.parse_args()
+    if args.command == "backfill":
+        if args.days is not None and args.since:
+            parser.error("--days and --since cannot be combined")
+        if args.days is None and not args.since:
+            args.days = 365
+        if args.topics is None:
+            args.topics = parse_topics("all")
+        if args.workers is None:
+            args.workers = 4
+        if args.rate <= 0:
+            parser.error("--rate must be positive")
+    if args.command == "prefetch" and args.topics is None:
+        args.topics = parse_topics("all")
+    if args.days is not None and args.days < 1:
+        parser.error("--days must be at least 1")
+    if args.until and not (args.days or args.since):
+        parser.error("--until requires --days or --since")
+    # An empty window would otherwise fall back to today's or last week's page
+    until = args.until or datetime.now().date() - timedelta(days=2)
+    if args.since and args.since > until:
+        parser.error(f"--since must not be after --until ({until:%Y-%m-%d})")
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    if args.max_df is not None and not 0 < args.max_df <= 1:
+        parser.error("--max-df must be above 0 and at most 1")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be positive")
+    if args.from_archive is not None and (args.topics or args.watch):
+        parser.error("--from-archive analyzes a single topic's past pages")
+    if args.watch is not None:
+        if args.watch <= 0:
+            parser.error("--watch interval must be positive")
+        if args.topics or args.last_week or args.days or args.since:
+            parser.error("--watch only applies to today's page for a single topic")
+
+    scraper = BrutalistReportScraper()
+    listener = install_cancel_handlers(scraper)
+    try:
+        scraper.workers = max(1, args.workers or 1)
+        if args.no_cache:
+            scraper.result_cache = None
+            scraper.page_cache = None
+        if args.compact:
+            scraper.output_format = "compact"
+        scraper.output_path = args.output
+        scraper.deadline = args.deadline
+        scraper.top_k = args.top_k
+        if args.max_df is not None:
+            scraper.max_df = args.max_df
+        if args.metrics:
+            scraper.metrics = Metrics()
+            scraper.metrics_path = args.metrics
+        dates = None
+        if args.days or args.since:
+            dates = scraper._window_dates(args.days, args.since, args.until)
+        scraper.extract_images = args.images
+        scraper.probe_images = args.probe_images
+        if args.command == "backfill":
+            scraper.run_backfill(
+                args.topics,
+                scraper._window_dates(args.days, args.since, args.until),
+                db_path=args.db,
+                rate=args.rate,
+            )
+        elif args.command == "prefetch":
+            scraper.run_prefetch(args.topics)
+        elif args.command == "serve-images":
+            scraper.serve_images(listener)
+        elif args.command == "archive":
+            scraper.run_import_archive(args.db, args.dir)
+        elif args.from_archive is not None:
+            scraper.run_archive(args.from_archive or None, args.topic, dates)
+        elif args.images_for is not None:
+            scraper.run_images(args.images_for)
+        elif args.topics:
+            scraper.run_batch(args.topics, last_week=args.last_week, dates=dates)
+        else:
+            scraper.run(
+                topic=args.topic, last_week=args.last_week, dates=dates, watch=args.watch
+            )
+        scraper.write_metrics()
+    except (AnalysisCancelled, KeyboardInterrupt):
+        scraper.cancel("SIGINT")
+        scraper.write_metrics()
+        print(
+            json.dumps(
+                {
+                    "status": "cancelled",
+                    "reason": scraper.cancel_reason,
+                    "message": "Operation cancelled by user.",
+                }
+            ),
+            flush=True,
+        )
+        # Exit now rather than waiting on fetch threads or scoring workers
+        # that are still finishing in-flight work
+        os._exit(0 if scraper.cancel_reason == "stdin" else 130)
     except Exception as e:
         print(json.dumps({"status": "error", "message": str(e)}))
         sys.exit(1)
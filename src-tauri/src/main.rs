@@ -1,12 +1,16 @@
 // Prevents additional console window on Windows in release, DO NOT REMOVE!!
 #![cfg_attr(not(debug_assertions), windows_subsystem = "windows")]
 
-use std::process::{Command, Stdio};
-use std::io::{BufRead, BufReader};
+use std::process::{Child, ChildStdin, Command, Stdio};
+use std::io::{BufRead, BufReader, Write};
+use std::sync::Mutex;
 use tauri::{command};
 
+// Stdin of the running analysis, used to send it a cancel request
+static PYTHON_STDIN: Mutex<Option<ChildStdin>> = Mutex::new(None);
+
 #[command]
-async fn run_python_script(window: tauri::Window, topic: Option<String>, last_week: bool) -> Result<(), String> {
+async fn run_python_script(app: tauri::AppHandle, window: tauri::Window, topic: Option<String>, last_week: bool) -> Result<(), String> {
     let mut cmd_args = vec!["brutalist_report.py".to_string()];
     
     // Add topic if provided
@@ -19,6 +23,16 @@ async fn run_python_script(window: tauri::Window, topic: Option<String>, last_we
     if last_week {
         cmd_args.push("--last-week".to_string());
     }
+
+    // Write the result compactly to a file the frontend can read, so stdout
+    // only carries progress events and a small result_file pointer
+    let cache_dir = app.path_resolver().app_cache_dir()
+        .ok_or_else(|| "Failed to resolve the app cache directory".to_string())?;
+    std::fs::create_dir_all(&cache_dir)
+        .map_err(|e| format!("Failed to create the app cache directory: {}", e))?;
+    cmd_args.push("--compact".to_string());
+    cmd_args.push("--output".to_string());
+    cmd_args.push(cache_dir.join("latest_result.json").to_string_lossy().into_owned());
     
     // For debugging
     println!("Running command: python {:?}", cmd_args);
@@ -33,11 +47,15 @@ async fn run_python_script(window: tauri::Window, topic: Option<String>, last_we
     // Execute Python script with piped output
     let mut child = Command::new(python_cmd)
         .args(&cmd_args)
+        .stdin(Stdio::piped())
         .stdout(Stdio::piped())
         .stderr(Stdio::piped())
         .spawn()
         .map_err(|e| format!("Failed to execute Python script: {}", e))?;
 
+    // Keep stdin so the analysis can be cancelled
+    *PYTHON_STDIN.lock().map_err(|e| e.to_string())? = child.stdin.take();
+
     // Get stdout handle
     let stdout = child.stdout.take()
         .ok_or_else(|| "Failed to capture stdout".to_string())?;
@@ -64,6 +82,7 @@ async fn run_python_script(window: tauri::Window, topic: Option<String>, last_we
     // Wait for the process to complete
     let status = child.wait()
         .map_err(|e| format!("Error waiting for Python process: {}", e))?;
+    *PYTHON_STDIN.lock().map_err(|e| e.to_string())? = None;
 
     if !status.success() {
         return Err("Python script failed".to_string());
@@ -72,9 +91,113 @@ async fn run_python_script(window: tauri::Window, topic: Option<String>, last_we
     Ok(())
 }
 
+#[command]
+fn cancel_python_script() -> Result<(), String> {
+    let mut stdin = PYTHON_STDIN.lock().map_err(|e| e.to_string())?;
+
+    // The script emits {"status": "cancelled"} and exits once it sees this
+    if let Some(stdin) = stdin.as_mut() {
+        stdin.write_all(b"cancel\n")
+            .and_then(|_| stdin.flush())
+            .map_err(|e| format!("Failed to send cancel request: {}", e))?;
+    }
+
+    Ok(())
+}
+
+// Long-lived image worker and its stdin; every image request goes to this
+// one process so concurrent requests for the same article share a fetch
+static IMAGE_WORKER: Mutex<Option<(Child, ChildStdin)>> = Mutex::new(None);
+
+fn spawn_image_worker(window: &tauri::Window) -> Result<(Child, ChildStdin), String> {
+    let python_cmd = if cfg!(target_os = "windows") {
+        "python"
+    } else {
+        "python3"
+    };
+
+    let mut child = Command::new(python_cmd)
+        .args(["brutalist_report.py", "--probe-images", "serve-images"])
+        .stdin(Stdio::piped())
+        .stdout(Stdio::piped())
+        .stderr(Stdio::inherit())
+        .spawn()
+        .map_err(|e| format!("Failed to start image worker: {}", e))?;
+
+    let stdin = child.stdin.take()
+        .ok_or_else(|| "Failed to capture image worker stdin".to_string())?;
+    let stdout = child.stdout.take()
+        .ok_or_else(|| "Failed to capture image worker stdout".to_string())?;
+
+    // Runs alongside an analysis, so its output goes to a separate event
+    let window = window.clone();
+    std::thread::spawn(move || {
+        for line in BufReader::new(stdout).lines().map_while(Result::ok) {
+            if !line.trim().is_empty() {
+                let _ = window.emit("python-images", line);
+            }
+        }
+    });
+
+    Ok((child, stdin))
+}
+
+#[command]
+fn fetch_group_images(window: tauri::Window, groups: String) -> Result<(), String> {
+    let groups: serde_json::Value = serde_json::from_str(&groups)
+        .map_err(|e| format!("Invalid image request: {}", e))?;
+    let request = serde_json::json!({ "command": "images", "groups": groups });
+
+    let mut worker = IMAGE_WORKER.lock().map_err(|e| e.to_string())?;
+
+    // Start the worker on first use, or again if it has exited
+    let running = match worker.as_mut() {
+        Some((child, _)) => matches!(child.try_wait(), Ok(None)),
+        None => false,
+    };
+    if !running {
+        *worker = Some(spawn_image_worker(&window)?);
+    }
+
+    // Images arrive as python-images events, one per group
+    let (_, stdin) = worker.as_mut().ok_or_else(|| "Image worker is not running".to_string())?;
+    writeln!(stdin, "{}", request)
+        .and_then(|_| stdin.flush())
+        .map_err(|e| format!("Failed to send image request: {}", e))
+}
+
+#[command]
+fn start_prefetch() -> Result<(), String> {
+    let python_cmd = if cfg!(target_os = "windows") {
+        "python"
+    } else {
+        "python3"
+    };
+
+    // Warms the page, result and image caches; its output is not needed
+    let mut child = Command::new(python_cmd)
+        .args(["brutalist_report.py", "--probe-images", "prefetch"])
+        .stdin(Stdio::null())
+        .stdout(Stdio::null())
+        .stderr(Stdio::null())
+        .spawn()
+        .map_err(|e| format!("Failed to start prefetch: {}", e))?;
+
+    std::thread::spawn(move || {
+        let _ = child.wait();
+    });
+
+    Ok(())
+}
+
 fn main() {
     tauri::Builder::default()
-        .invoke_handler(tauri::generate_handler![run_python_script])
+        .invoke_handler(tauri::generate_handler![
+            run_python_script,
+            cancel_python_script,
+            fetch_group_images,
+            start_prefetch
+        ])
         .run(tauri::generate_context!())
         .expect("error while running tauri application");
 }
\ No newline at end of file
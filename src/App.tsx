@@ -1,6 +1,7 @@
 "use client";
 
-import { useState } from "react";
+import { useState, useEffect } from "react";
+import { invoke } from "@tauri-apps/api/tauri";
 import { BarChart2, TrendingUp, Globe, FolderOpen } from "lucide-react";
 import TopicSelector from "./components/TopicSelector";
 import JobStatus from "./components/JobStatus";
@@ -12,7 +13,12 @@ import type { AnalysisResult } from "./types/analysis";
 function App() {
 	const [selectedTopic, setSelectedTopic] = useState<string | null>(null);
 	const [timeRange, setTimeRange] = useState<"today" | "last-week">("today");
-	const { startAnalysis, status, result, message, loadFromFile, saveToFile, processedCount, totalCount } = useAnalysis();
+	const { startAnalysis, cancelAnalysis, status, result, message, loadFromFile, saveToFile, processedCount, totalCount } = useAnalysis();
+
+	// Warm the caches in the background so the first analysis is quick
+	useEffect(() => {
+		invoke("start_prefetch").catch((error) => console.warn("Prefetch failed to start:", error));
+	}, []);
 
 	const handleStartAnalysis = () => {
 		startAnalysis(selectedTopic, timeRange === "last-week");
@@ -95,7 +101,13 @@ function App() {
 								<span className="bg-indigo-900/60 text-indigo-200 text-xs px-2 py-0.5 rounded-full">Step 2: Processing</span>
 							</div>
 
-							<JobStatus status={status} message={message} processedCount={processedCount} totalCount={totalCount} />
+							<JobStatus
+								status={status}
+								message={message}
+								processedCount={processedCount}
+								totalCount={totalCount}
+								onCancel={cancelAnalysis}
+							/>
 						</div>
 					</section>
 				)}
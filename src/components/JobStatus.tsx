@@ -1,14 +1,16 @@
 import type React from "react"
-import { Loader2, CheckCircle, AlertCircle, Clock, Server } from "lucide-react"
+import { Loader2, CheckCircle, AlertCircle, Clock, Server, XCircle } from "lucide-react"
+import Button from "./ui/Button"
 
 interface JobStatusProps {
   status: "idle" | "loading" | "success" | "error"
   message: string
   processedCount?: number
   totalCount?: number
+  onCancel?: () => void
 }
 
-const JobStatus: React.FC<JobStatusProps> = ({ status, message, processedCount, totalCount }) => {
+const JobStatus: React.FC<JobStatusProps> = ({ status, message, processedCount, totalCount, onCancel }) => {
   // Calculate progress percentage
   const progressPercentage = processedCount && totalCount ? Math.round((processedCount / totalCount) * 100) : 0
 
@@ -65,6 +67,12 @@ const JobStatus: React.FC<JobStatusProps> = ({ status, message, processedCount,
           {status === "success" && "Analysis completed"}
           {status === "error" && "Error"}
         </span>
+        {status === "loading" && onCancel && (
+          <Button variant="outline" size="sm" className="ml-auto" onClick={onCancel}>
+            <XCircle className="h-3 w-3 mr-1" />
+            Cancel
+          </Button>
+        )}
       </div>
 
       {status === "loading" && !isDateProcessing && processedCount !== undefined && totalCount !== undefined && (
@@ -8,6 +8,7 @@ import Modal from "./ui/Modal"
 import TopicGroupCard from "./TopicGroupCard"
 import WordCloud from "./WordCloud"
 import { useAnalysis } from "../hooks/useAnalysis"
+import { useGroupImages } from "../hooks/useGroupImages"
 import type { AnalysisResult } from "../types/analysis"
 
 interface ResultsViewProps {
@@ -20,6 +21,9 @@ const ResultsView: React.FC<ResultsViewProps> = ({ result, onSaveResults, onLoad
   const [expandedGroups, setExpandedGroups] = useState<Set<number>>(new Set())
   const [showWordCloud, setShowWordCloud] = useState(false)
   const { showSaveModal, saveModalMessage, setShowSaveModal } = useAnalysis()
+  const { images, pending, requestImage } = useGroupImages(
+    `${result.date}|${result.topic}|${result.is_last_week}`,
+  )
 
   const toggleGroup = (index: number) => {
     const newSet = new Set(expandedGroups)
@@ -27,6 +31,8 @@ const ResultsView: React.FC<ResultsViewProps> = ({ result, onSaveResults, onLoad
       newSet.delete(index)
     } else {
       newSet.add(index)
+      // Look up the group's image the first time it is expanded
+      requestImage(result.common_topics[index])
     }
     setExpandedGroups(newSet)
   }
@@ -94,7 +100,8 @@ const ResultsView: React.FC<ResultsViewProps> = ({ result, onSaveResults, onLoad
         {result.common_topics.map((group, index) => (
           <TopicGroupCard
             key={index}
-            group={group}
+            group={images[group.id] ? { ...group, image: images[group.id] } : group}
+            imageLoading={pending.has(group.id)}
             isExpanded={expandedGroups.has(index)}
             onToggle={() => toggleGroup(index)}
           />
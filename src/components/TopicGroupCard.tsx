@@ -15,6 +15,7 @@ import {
   ExternalLinkIcon,
   AlertCircle,
   Info,
+  Loader2,
 } from "lucide-react"
 import { cn } from "../utils"
 import type { TopicGroup } from "../types/analysis"
@@ -23,9 +24,11 @@ interface TopicGroupCardProps {
   group: TopicGroup
   isExpanded: boolean
   onToggle: () => void
+  // True while the group's image is being looked up on demand
+  imageLoading?: boolean
 }
 
-const TopicGroupCard: React.FC<TopicGroupCardProps> = ({ group, isExpanded, onToggle }) => {
+const TopicGroupCard: React.FC<TopicGroupCardProps> = ({ group, isExpanded, onToggle, imageLoading }) => {
   // Group headlines by source
   const headlinesBySource: Record<string, Array<{ title: string; url: string; time?: string }>> = {}
   const [imageError, setImageError] = useState(false)
@@ -48,7 +51,7 @@ const TopicGroupCard: React.FC<TopicGroupCardProps> = ({ group, isExpanded, onTo
   // Check if we have a successful image or error information
   const hasSuccessfulImage = group.image && group.image.url && !group.image.error
   const hasImageError = group.image && group.image.error
-  const shouldShowImageContainer = hasSuccessfulImage || hasImageError
+  const shouldShowImageContainer = hasSuccessfulImage || hasImageError || imageLoading
 
   return (
     <div className="bg-gray-700/80 rounded-xl overflow-hidden transition-all duration-200 border border-gray-600/50 shadow-md h-full flex flex-col hover:shadow-lg hover:border-indigo-800/50">
@@ -79,12 +82,18 @@ const TopicGroupCard: React.FC<TopicGroupCardProps> = ({ group, isExpanded, onTo
       {/* =====================================================================
           EXPERIMENTAL FEATURE: Real Article Image Header with Error Display
           This section displays an image extracted from news articles OR shows error information
-          The image data is saved in the JSON and comes from the Python backend
+          The image data comes from the Python backend, either saved in the JSON or
+          looked up on demand when the card is first expanded
           If you want to remove this feature, delete this entire div block
           ===================================================================== */}
       {shouldShowImageContainer && (
         <div className="relative h-40 overflow-hidden">
-          {hasSuccessfulImage && !imageError ? (
+          {!group.image ? (
+            <div className="w-full h-full bg-gray-800/90 flex items-center justify-center text-xs text-gray-300">
+              <Loader2 className="h-4 w-4 mr-2 animate-spin text-indigo-400" />
+              Loading image...
+            </div>
+          ) : hasSuccessfulImage && !imageError ? (
             <>
               {/* Successful image display */}
               <img
@@ -5,7 +5,8 @@ import { invoke } from "@tauri-apps/api/tauri"
 import { listen } from "@tauri-apps/api/event"
 import { open, save } from "@tauri-apps/api/dialog"
 import { readTextFile, writeTextFile } from "@tauri-apps/api/fs"
-import type { AnalysisResult } from "../types/analysis"
+import type { AnalysisResult, CompactAnalysisResult } from "../types/analysis"
+import { expandResult } from "../utils"
 
 export function useAnalysis() {
   const [status, setStatus] = useState<"idle" | "loading" | "success" | "error">("idle")
@@ -20,6 +21,13 @@ export function useAnalysis() {
   useEffect(() => {
     console.log("Setting up Python output listener") // Debug log
 
+    const finishWithResult = (data: AnalysisResult | CompactAnalysisResult) => {
+      setResult(expandResult(data))
+      setProgress(100)
+      setMessage("Analysis completed successfully")
+      setStatus("success")
+    }
+
     // Set up event listener for Python output
     const unlisten = listen<string>("python-output", (event) => {
       console.log("Received Python output:", event.payload) // Debug log
@@ -44,12 +52,20 @@ export function useAnalysis() {
         } else if (data.status === "error") {
           setMessage(data.message)
           setStatus("error")
+        } else if (data.status === "cancelled") {
+          setMessage("Analysis cancelled")
+          setStatus("idle")
+        } else if (data.status === "result_file") {
+          // The result was written to disk; only a pointer came through stdout
+          readTextFile(data.path)
+            .then((content) => finishWithResult(JSON.parse(content)))
+            .catch((error) => {
+              setMessage(`Error reading result file: ${String(error)}`)
+              setStatus("error")
+            })
         } else if (!data.status) {
           // This is the final result
-          setResult(data)
-          setProgress(100)
-          setMessage("Analysis completed successfully")
-          setStatus("success")
+          finishWithResult(data)
         }
       } catch (parseError) {
         console.warn("Failed to parse Python output:", event.payload, parseError)
@@ -83,6 +99,15 @@ export function useAnalysis() {
     }
   }
 
+  const cancelAnalysis = async () => {
+    try {
+      setMessage("Cancelling analysis...")
+      await invoke("cancel_python_script")
+    } catch (error) {
+      console.error("Error cancelling analysis:", error)
+    }
+  }
+
   const saveToFile = async () => {
     if (!result) return
 
@@ -122,8 +147,8 @@ export function useAnalysis() {
 
       if (selected && typeof selected === "string") {
         const content = await readTextFile(selected)
-        const data = JSON.parse(content) as AnalysisResult
-        setResult(data)
+        const data = JSON.parse(content) as AnalysisResult | CompactAnalysisResult
+        setResult(expandResult(data))
         setStatus("success")
         setProgress(100)
         setMessage(`Loaded results from ${selected}`)
@@ -137,6 +162,7 @@ export function useAnalysis() {
 
   return {
     startAnalysis,
+    cancelAnalysis,
     saveToFile,
     loadFromFile,
     status,
@@ -0,0 +1,73 @@
+"use client"
+
+import { useState, useEffect } from "react"
+import { invoke } from "@tauri-apps/api/tauri"
+import { listen } from "@tauri-apps/api/event"
+import type { ArticleImage, TopicGroup } from "../types/analysis"
+
+// Images are no longer extracted during analysis; this looks them up per
+// group on demand. `resultKey` identifies the result the groups belong to.
+export function useGroupImages(resultKey: string) {
+  const [images, setImages] = useState<Record<number, ArticleImage>>({})
+  const [pending, setPending] = useState<Set<number>>(new Set())
+
+  const settle = (groupId: number) => {
+    setPending((prev) => {
+      const next = new Set(prev)
+      next.delete(groupId)
+      return next
+    })
+  }
+
+  // Group ids are only unique within one result
+  useEffect(() => {
+    setImages({})
+    setPending(new Set())
+  }, [resultKey])
+
+  useEffect(() => {
+    const unlisten = listen<string>("python-images", (event) => {
+      try {
+        const data = JSON.parse(event.payload)
+        if (data.status === "image") {
+          setImages((prev) => ({ ...prev, [data.id]: data.image }))
+          settle(data.id)
+        }
+      } catch (parseError) {
+        console.warn("Failed to parse image output:", event.payload, parseError)
+      }
+    })
+
+    return () => {
+      unlisten.then((fn) => fn())
+    }
+  }, [])
+
+  const requestImage = async (group: TopicGroup) => {
+    if (group.image || images[group.id] || pending.has(group.id)) return
+    setPending((prev) => new Set(prev).add(group.id))
+
+    // Extraction only ever tries the first headline of each source
+    const seenSources = new Set<string>()
+    const headlines = group.headlines
+      .filter((headline) => {
+        if (seenSources.has(headline.source)) return false
+        seenSources.add(headline.source)
+        return true
+      })
+      .map(({ source, url }) => ({ source, url }))
+
+    // The request is queued on the image worker; the group settles when its
+    // image event arrives
+    try {
+      await invoke("fetch_group_images", {
+        groups: JSON.stringify([{ id: group.id, topic_name: group.topic_name, headlines }]),
+      })
+    } catch (error) {
+      console.error("Error fetching group image:", error)
+      settle(group.id)
+    }
+  }
+
+  return { images, pending, requestImage }
+}
@@ -3,12 +3,16 @@ export interface Headline {
   url: string
   source: string
   time?: string
+  source_link?: { text: string; url: string } | null
 }
 
 export interface ArticleImage {
   url?: string
   alt?: string
   source_url?: string
+  // Probed dimensions, present when the image header was checked
+  width?: number
+  height?: number
   // Error information when image extraction fails
   error?: string
   error_type?: string
@@ -39,4 +43,33 @@ export interface AnalysisResult {
   common_topics: TopicGroup[]
   total_groups: number
   total_headlines: number
+  // Whether the groups came from the on-disk result cache
+  cache_status?: "hit" | "miss" | "disabled"
+  // Seconds spent per stage (fetch, clustering, images) and in total
+  timings?: Record<string, number>
+  // Set when only the K largest groups were assembled (--top-k)
+  top_k?: number
+  // Present when the run had a --deadline; exceeded lists degraded stages
+  deadline?: {
+    seconds: number
+    exceeded: string[]
+    partial: boolean
+  }
+}
+
+// Compact output: headlines stored once, groups reference them by row index
+export type CompactHeadlineRow = [
+  source: number,
+  title: string,
+  url: string,
+  time: string | null,
+  source_link: { text: string; url: string } | null,
+]
+
+export interface CompactAnalysisResult extends Omit<AnalysisResult, "common_topics"> {
+  format: "compact"
+  sources: string[]
+  headline_fields: string[]
+  headlines: CompactHeadlineRow[]
+  common_topics: Array<Omit<TopicGroup, "headlines"> & { headlines: number[] }>
 }
@@ -1,6 +1,34 @@
 import { type ClassValue, clsx } from 'clsx';
 import { twMerge } from 'tailwind-merge';
+import type { AnalysisResult, CompactAnalysisResult } from './types/analysis';
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
-}
\ No newline at end of file
+}
+
+// Expands a compact result back into the regular result shape
+export function expandResult(data: AnalysisResult | CompactAnalysisResult): AnalysisResult {
+  if (!('format' in data) || data.format !== 'compact') {
+    return data as AnalysisResult;
+  }
+
+  // Everything but the headline tables carries over as-is
+  // eslint-disable-next-line @typescript-eslint/no-unused-vars
+  const { format, sources, headline_fields, headlines, common_topics, ...rest } = data;
+  return {
+    ...rest,
+    common_topics: common_topics.map((group) => ({
+      ...group,
+      headlines: group.headlines.map((row) => {
+        const [source, title, url, time, source_link] = headlines[row];
+        return {
+          source: sources[source],
+          title,
+          url,
+          time: time ?? undefined,
+          source_link: source_link ?? undefined,
+        };
+      }),
+    })),
+  };
+}